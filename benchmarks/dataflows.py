@@ -0,0 +1,508 @@
+"""
+Micro-benchmark every data tool in dataflows local.py, y_finance.py and stockstats_utils.py.
+
+Synthetic fixtures of realistic size are generated first: 15 years of daily
+OHLCV, full-market SimFin statement CSVs, multi-MB Finnhub news and insider
+JSON, and large Reddit JSONL dumps. Each entry point is then called once cold
+(building its on-disk store or index in a fresh cache directory) and
+--repeat times warm. The yfinance-backed functions get a fixture stand-in
+for yfinance, so only their local processing is measured.
+
+Results are appended to a JSON file keyed by git commit (a "-dirty" suffix
+marks uncommitted changes) and compared with an earlier commit, so
+optimizations can be checked against the same fixtures.
+
+Usage: python -m benchmarks.dataflows [--scale 1.0] [--repeat 5] [--filter simfin] [--data-dir DIR]
+                                     [--results benchmarks/results/dataflows.json] [--compare REV]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.dataflows import local, stockstats_utils, y_finance
+from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.stockstats_utils import StockstatsUtils
+from tradingagents.default_config import DEFAULT_CONFIG
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RESULTS = os.path.join(REPO_ROOT, "benchmarks", "results", "dataflows.json")
+
+# Reddit company news only matches tickers known to reddit_utils
+TICKER = "AAPL"
+COMPANY = "Apple"
+REDDIT_TICKERS = [TICKER, "MSFT", "NVDA", "TSLA", "META", "AMZN", "GOOGL", "SQ"]
+CURR_DATE = "2025-03-20"
+PRICE_FILE = f"{TICKER}-YFin-data-2015-01-01-2025-03-25.csv"
+INDICATORS = ["close_50_sma", "close_200_sma", "close_10_ema", "macd", "rsi", "boll_ub", "boll_lb", "atr"]
+
+# Bump when the generated fixtures change so cached --data-dir copies are rebuilt
+FIXTURE_VERSION = 1
+
+WORDS = (
+    "shares rally after earnings beat guidance raised analysts cut price target "
+    "supply chain demand outlook margin pressure buyback dividend regulator probe "
+    "launch delay record revenue iphone services growth slows china sales market"
+).split()
+
+
+def _days_before(date: str, days: int) -> str:
+    return (datetime.strptime(date, "%Y-%m-%d") - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+# Fixtures
+
+
+def make_prices(years=15):
+    """Daily OHLCV for every business day of the last years years up to 2025-03-25."""
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(end="2025-03-25", periods=int(252 * years))
+    close = 30 * np.exp(np.cumsum(rng.normal(0.0004, 0.018, len(dates))))
+    open_ = close * (1 + rng.normal(0, 0.005, len(dates)))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.02, len(dates)))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.02, len(dates)))
+    return pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": open_.round(4),
+            "High": high.round(4),
+            "Low": low.round(4),
+            "Close": close.round(4),
+            "Adj Close": close.round(4),
+            "Volume": rng.integers(10**7, 2 * 10**8, len(dates)),
+        }
+    )
+
+
+def write_prices(data_dir, cache_dir, prices):
+    # local.py, the local indicator engine and StockstatsUtils each read their own copy
+    for directory in (
+        os.path.join(data_dir, "market_data", "price_data"),
+        cache_dir,
+        data_dir,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        prices.to_csv(os.path.join(directory, PRICE_FILE), index=False)
+
+
+SIMFIN_STATEMENTS = {
+    "balance_sheet": ("balance", ["Cash, Cash Equivalents & Short Term Investments", "Accounts & Notes Receivable", "Inventories", "Total Current Assets", "Property, Plant & Equipment, Net", "Long Term Investments & Receivables", "Total Noncurrent Assets", "Total Assets", "Payables & Accruals", "Short Term Debt", "Total Current Liabilities", "Long Term Debt", "Total Noncurrent Liabilities", "Total Liabilities", "Share Capital & Additional Paid-In Capital", "Treasury Stock", "Retained Earnings", "Total Equity", "Total Liabilities & Equity"]),
+    "cash_flow": ("cashflow", ["Net Income/Starting Line", "Depreciation & Amortization", "Non-Cash Items", "Change in Working Capital", "Change in Accounts Receivable", "Change in Inventories", "Change in Accounts Payable", "Net Cash from Operating Activities", "Change in Fixed Assets & Intangibles", "Net Change in Long Term Investment", "Net Cash from Investing Activities", "Dividends Paid", "Cash from (Repayment of) Debt", "Cash from (Repurchase of) Equity", "Net Cash from Financing Activities", "Net Change in Cash"]),
+    "income_statements": ("income", ["Revenue", "Cost of Revenue", "Gross Profit", "Operating Expenses", "Selling, General & Administrative", "Research & Development", "Depreciation & Amortization", "Operating Income (Loss)", "Non-Operating Income (Loss)", "Interest Expense, Net", "Pretax Income (Loss)", "Income Tax (Expense) Benefit, Net", "Net Income", "Net Income (Common)"]),
+}
+
+
+def write_simfin(data_dir, tickers, quarters):
+    """One quarterly statement per ticker and quarter, like SimFin's all-US bulk files."""
+    rng = np.random.default_rng(1)
+    names = [TICKER] + [f"S{i:04d}" for i in range(tickers - 1)]
+    report_dates = pd.date_range(end="2025-01-01", periods=quarters, freq="QE")
+    rows = len(names) * quarters
+
+    ticker_col = np.repeat(names, quarters)
+    report_col = pd.DatetimeIndex(np.tile(report_dates, len(names)))
+    publish_col = report_col + pd.to_timedelta(rng.integers(20, 60, rows), unit="D")
+
+    for statement, (file_kind, columns) in SIMFIN_STATEMENTS.items():
+        frame = pd.DataFrame(
+            {
+                "Ticker": ticker_col,
+                "SimFinId": np.repeat(np.arange(len(names)) + 10_000, quarters),
+                "Currency": "USD",
+                "Fiscal Year": report_col.year,
+                "Fiscal Period": ["Q" + str((m - 1) // 3 + 1) for m in report_col.month],
+                "Report Date": report_col.strftime("%Y-%m-%d"),
+                "Publish Date": publish_col.strftime("%Y-%m-%d"),
+                "Restated Date": publish_col.strftime("%Y-%m-%d"),
+                "Shares (Basic)": rng.integers(10**7, 10**10, rows),
+                "Shares (Diluted)": rng.integers(10**7, 10**10, rows),
+                **{column: rng.integers(-(10**10), 10**11, rows) for column in columns},
+            }
+        )
+        directory = os.path.join(data_dir, "fundamental_data", "simfin_data_all", statement, "companies", "us")
+        os.makedirs(directory, exist_ok=True)
+        frame.to_csv(os.path.join(directory, f"us-{file_kind}-quarterly.csv"), sep=";", index=False)
+
+
+def write_finnhub(data_dir, days, news_per_day, insiders):
+    """Daily news and daily insider snapshots, each snapshot repeating most earlier filings."""
+    rng = random.Random(2)
+    end = datetime.strptime(CURR_DATE, "%Y-%m-%d")
+    dates = [(end - timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(days)]
+
+    news = {
+        day: [
+            {
+                "category": "company",
+                "datetime": int(datetime.strptime(day, "%Y-%m-%d").timestamp()),
+                "headline": f"{COMPANY} {_text(rng, 8)}",
+                "id": rng.getrandbits(31),
+                "related": TICKER,
+                "source": rng.choice(["Yahoo", "MarketWatch", "SeekingAlpha", "Reuters"]),
+                "summary": _text(rng, 45),
+                "url": f"https://example.com/news/{rng.getrandbits(40):x}",
+            }
+            for _ in range(news_per_day)
+        ]
+        for day in dates
+    }
+
+    filings = [
+        {
+            "name": f"Insider {i % 97}",
+            "share": rng.randint(1_000, 1_000_000),
+            "change": rng.randint(-50_000, 50_000),
+            "filingDate": _days_before(CURR_DATE, rng.randint(0, 90)),
+            "transactionDate": _days_before(CURR_DATE, rng.randint(0, 120)),
+            "transactionCode": rng.choice("SPMAG"),
+            "transactionPrice": round(rng.uniform(10, 900), 2),
+            "id": f"filing-{i}",
+            "isDerivative": False,
+            "currency": "USD",
+            "source": "S",
+            "symbol": TICKER,
+        }
+        for i in range(insiders)
+    ]
+    transactions = {day: rng.sample(filings, int(insiders * 0.9)) for day in dates}
+
+    sentiment = {
+        day: [
+            {
+                "symbol": TICKER,
+                "year": int(day[:4]) - (m // 12),
+                "month": 12 - m % 12,
+                "change": rng.randint(-10**6, 10**6),
+                "mspr": round(rng.uniform(-100, 100), 6),
+            }
+            for m in range(24)
+        ]
+        for day in dates
+    }
+
+    for data_type, data in (
+        ("news_data", news),
+        ("insider_trans", transactions),
+        ("insider_senti", sentiment),
+    ):
+        directory = os.path.join(data_dir, "finnhub_data", data_type)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{TICKER}_data_formatted.json"), "w") as f:
+            json.dump(data, f)
+
+
+def write_reddit(data_dir, posts_per_file, days):
+    """Subreddit dumps spread over days days; about one company post in ten mentions the company."""
+    rng = random.Random(3)
+    end = datetime.strptime(CURR_DATE, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() + 86_399
+    start = end - days * 86_400
+
+    for category, subreddits in (
+        ("global_news", ["worldnews", "news", "economics", "finance"]),
+        ("company_news", ["stocks", "investing", "wallstreetbets", "stockmarket", "options", "apple", "technology", "securityanalysis"]),
+    ):
+        directory = os.path.join(data_dir, "reddit_data", category)
+        os.makedirs(directory, exist_ok=True)
+        for subreddit in subreddits:
+            with open(os.path.join(directory, f"{subreddit}.jsonl"), "w") as f:
+                for _ in range(posts_per_file):
+                    title = _text(rng, 10)
+                    if category == "company_news" and rng.random() < 0.1:
+                        title = f"{COMPANY} {title}"
+                    post = {
+                        "id": f"{rng.getrandbits(36):x}",
+                        "subreddit": subreddit,
+                        "created_utc": int(rng.uniform(start, end)),
+                        "title": title,
+                        "selftext": _text(rng, rng.randint(0, 120)),
+                        "url": f"https://reddit.com/r/{subreddit}/{rng.getrandbits(36):x}",
+                        "ups": rng.randint(0, 50_000),
+                        "num_comments": rng.randint(0, 5_000),
+                    }
+                    f.write(json.dumps(post) + "\n")
+
+
+def fixture_sizes(scale):
+    return {
+        "version": FIXTURE_VERSION,
+        "price_years": 15,
+        "simfin_tickers": max(1, int(4000 * scale)),
+        "simfin_quarters": 40,
+        "finnhub_days": max(1, int(365 * scale)),
+        "finnhub_news_per_day": 25,
+        "finnhub_insiders": 200,
+        "reddit_posts_per_file": max(1, int(10_000 * scale)),
+        "reddit_days": 730,
+    }
+
+
+def make_fixtures(data_dir, cache_dir, scale):
+    """Generate the fixtures into data_dir unless a copy of the same size is already there."""
+    sizes = fixture_sizes(scale)
+    marker = os.path.join(data_dir, "fixtures.json")
+    try:
+        with open(marker) as f:
+            if json.load(f) == sizes:
+                write_prices(data_dir, cache_dir, make_prices(sizes["price_years"]))
+                return sizes, 0.0
+    except (OSError, ValueError):
+        pass
+
+    start = time.perf_counter()
+    write_prices(data_dir, cache_dir, make_prices(sizes["price_years"]))
+    write_simfin(data_dir, sizes["simfin_tickers"], sizes["simfin_quarters"])
+    write_finnhub(data_dir, sizes["finnhub_days"], sizes["finnhub_news_per_day"], sizes["finnhub_insiders"])
+    write_reddit(data_dir, sizes["reddit_posts_per_file"], sizes["reddit_days"])
+    with open(marker, "w") as f:
+        json.dump(sizes, f)
+    return sizes, time.perf_counter() - start
+
+
+def directory_size_mb(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total / (1024 * 1024)
+
+
+# yfinance stand-in
+
+
+class FixtureTicker:
+    """The parts of yfinance.Ticker used by y_finance.py, served from the price fixture."""
+
+    def __init__(self, symbol, prices):
+        self.symbol = symbol
+        self._prices = prices
+        rng = np.random.default_rng(4)
+        quarters = pd.date_range(end="2025-01-01", periods=5, freq="QE")[::-1]
+
+        def statement(columns):
+            return pd.DataFrame(rng.integers(10**8, 10**11, (len(columns), len(quarters))), index=columns, columns=quarters)
+
+        self.quarterly_balance_sheet = statement(SIMFIN_STATEMENTS["balance_sheet"][1])
+        self.quarterly_cashflow = statement(SIMFIN_STATEMENTS["cash_flow"][1])
+        self.quarterly_income_stmt = statement(SIMFIN_STATEMENTS["income_statements"][1])
+        self.balance_sheet = self.quarterly_balance_sheet
+        self.cashflow = self.quarterly_cashflow
+        self.income_stmt = self.quarterly_income_stmt
+        self.insider_transactions = pd.DataFrame(
+            {
+                "Shares": rng.integers(1_000, 10**6, 150),
+                "Value": rng.integers(10**5, 10**8, 150),
+                "Text": ["Sale at price 180.00 - 185.00 per share."] * 150,
+                "Insider": [f"Insider {i % 23}" for i in range(150)],
+                "Position": "Officer",
+                "Start Date": pd.date_range(end=CURR_DATE, periods=150, freq="2D"),
+            }
+        )
+
+    def history(self, start, end):
+        prices = self._prices.set_index(pd.DatetimeIndex(self._prices["Date"]).tz_localize("America/New_York"))
+        window = prices.loc[start:end].drop(columns=["Date", "Adj Close"])
+        return window.assign(Dividends=0.0, **{"Stock Splits": 0.0})
+
+
+class FixtureYFinance:
+    def __init__(self, prices):
+        self._prices = prices
+
+    def Ticker(self, symbol):
+        return FixtureTicker(symbol, self._prices)
+
+
+# Benchmarks
+
+
+def benchmarks(data_dir):
+    """(name, callable, args) for every entry point, in the order they run."""
+    week_ago = _days_before(CURR_DATE, 7)
+    two_weeks_ago = _days_before(CURR_DATE, 15)
+    year_ago = _days_before(CURR_DATE, 365)
+    return [
+        ("local.get_YFin_data_window", local.get_YFin_data_window, (TICKER, CURR_DATE, 30)),
+        ("local.get_YFin_data", local.get_YFin_data, (TICKER, year_ago, CURR_DATE)),
+        ("local.get_data_in_range", local.get_data_in_range, (TICKER, two_weeks_ago, CURR_DATE, "news_data", data_dir)),
+        ("local.get_finnhub_news", local.get_finnhub_news, (TICKER, week_ago, CURR_DATE)),
+        ("local.get_finnhub_company_insider_sentiment", local.get_finnhub_company_insider_sentiment, (TICKER, CURR_DATE)),
+        ("local.get_finnhub_company_insider_transactions", local.get_finnhub_company_insider_transactions, (TICKER, CURR_DATE)),
+        ("local.get_simfin_balance_sheet", local.get_simfin_balance_sheet, (TICKER, "quarterly", CURR_DATE)),
+        ("local.get_simfin_cashflow", local.get_simfin_cashflow, (TICKER, "quarterly", CURR_DATE)),
+        ("local.get_simfin_income_statements", local.get_simfin_income_statements, (TICKER, "quarterly", CURR_DATE)),
+        ("local.get_reddit_global_news", local.get_reddit_global_news, (CURR_DATE, 7, 5)),
+        ("local.get_reddit_company_news", local.get_reddit_company_news, (TICKER, week_ago, CURR_DATE)),
+        ("local.get_reddit_company_news_multi", local.get_reddit_company_news_multi, (REDDIT_TICKERS, week_ago, CURR_DATE)),
+        ("y_finance.get_stock_stats_indicators_window", y_finance.get_stock_stats_indicators_window, (TICKER, "rsi", CURR_DATE, 30)),
+        ("y_finance.get_stock_stats_indicators_table", y_finance.get_stock_stats_indicators_table, (TICKER, INDICATORS, CURR_DATE, 30)),
+        ("y_finance.get_stockstats_indicator", y_finance.get_stockstats_indicator, (TICKER, "close_50_sma", CURR_DATE)),
+        ("y_finance.get_YFin_data_online", y_finance.get_YFin_data_online, (TICKER, year_ago, CURR_DATE)),
+        ("y_finance.get_balance_sheet", y_finance.get_balance_sheet, (TICKER, "quarterly", CURR_DATE)),
+        ("y_finance.get_cashflow", y_finance.get_cashflow, (TICKER, "quarterly", CURR_DATE)),
+        ("y_finance.get_income_statement", y_finance.get_income_statement, (TICKER, "quarterly", CURR_DATE)),
+        ("y_finance.get_insider_transactions", y_finance.get_insider_transactions, (TICKER,)),
+        ("stockstats_utils.StockstatsUtils.get_stock_stats", StockstatsUtils.get_stock_stats, (TICKER, "macd", CURR_DATE)),
+    ]
+
+
+def run_benchmark(fn, args, repeat):
+    start = time.perf_counter()
+    result = fn(*args)
+    first = time.perf_counter() - start
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+
+    return {
+        "first_ms": first * 1000,
+        "median_ms": statistics.median(times) * 1000 if times else None,
+        "min_ms": min(times) * 1000 if times else None,
+        "result_chars": len(result) if isinstance(result, str) else len(str(result)),
+    }
+
+
+# Result tracking
+
+
+def git_revision():
+    """Short HEAD commit, with "-dirty" when tracked files have uncommitted changes."""
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], cwd=REPO_ROOT).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def load_history(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_history(path, history):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(history, f, indent=2)
+
+
+def pick_baseline(history, revision, compare, sizes):
+    """The run to compare with: --compare if given, else the latest other run on the same fixtures."""
+    if compare:
+        matches = [rev for rev in history if rev == compare or rev.startswith(compare)]
+        return (matches[-1], history[matches[-1]]) if matches else (None, None)
+    for rev in reversed(list(history)):
+        if rev != revision and history[rev].get("fixtures") == sizes:
+            return rev, history[rev]
+    return None, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies the SimFin, Finnhub and Reddit fixture sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="warm calls per entry point")
+    parser.add_argument("--filter", help="only run entry points matching this regular expression")
+    parser.add_argument("--data-dir", help="keep the fixtures here and reuse them across runs")
+    parser.add_argument("--results", default=DEFAULT_RESULTS, help="JSON file the results are tracked in")
+    parser.add_argument("--compare", help="commit to compare with (default: the previous run on the same fixtures)")
+    parser.add_argument("--no-save", action="store_true", help="do not record this run in the results file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.abspath(args.data_dir) if args.data_dir else os.path.join(tmp, "data")
+        # A fresh cache directory, so the first call of every entry point is cold
+        cache_dir = os.path.join(tmp, "cache")
+        os.makedirs(data_dir, exist_ok=True)
+
+        config = dict(DEFAULT_CONFIG)
+        config.update(
+            {
+                "data_dir": data_dir,
+                "data_cache_dir": cache_dir,
+                "data_vendors": {**DEFAULT_CONFIG["data_vendors"], "technical_indicators": "local"},
+            }
+        )
+        set_config(config)
+        # Both modules bind DATA_DIR at import time
+        local.DATA_DIR = data_dir
+        stockstats_utils.DATA_DIR = data_dir
+
+        sizes, generate_seconds = make_fixtures(data_dir, cache_dir, args.scale)
+        y_finance.yf = FixtureYFinance(make_prices(sizes["price_years"]))
+        print(
+            f"fixtures: {directory_size_mb(data_dir):.0f} MB in {data_dir}"
+            + (f" (generated in {generate_seconds:.1f}s)" if generate_seconds else " (reused)")
+        )
+
+        results = {}
+        pattern = re.compile(args.filter) if args.filter else None
+        for name, fn, fn_args in benchmarks(data_dir):
+            if pattern and not pattern.search(name):
+                continue
+            results[name] = run_benchmark(fn, fn_args, args.repeat)
+
+    revision = git_revision()
+    history = load_history(args.results)
+    baseline_rev, baseline = pick_baseline(history, revision, args.compare, sizes)
+    baseline_results = baseline["results"] if baseline else {}
+
+    header = f"{'entry point':50} {'first ms':>10} {'median ms':>10} {'min ms':>10} {'chars':>9}"
+    if baseline_rev:
+        header += f"  speedup vs {baseline_rev}"
+    print(f"\nrevision {revision}, {args.repeat} warm calls each\n")
+    print(header)
+    for name, result in results.items():
+        median = result["median_ms"]
+        line = (
+            f"{name:50} {result['first_ms']:10.2f} "
+            f"{median if median is not None else float('nan'):10.2f} "
+            f"{result['min_ms'] if result['min_ms'] is not None else float('nan'):10.2f} "
+            f"{result['result_chars']:9d}"
+        )
+        previous = baseline_results.get(name, {}).get("median_ms")
+        if previous and median:
+            line += f"  {previous / median:5.2f}x"
+        print(line)
+
+    if not args.no_save:
+        previous = history.pop(revision, {})
+        if previous.get("fixtures") == sizes and previous.get("repeat") == args.repeat:
+            # Keep entry points measured by an earlier, filtered run of this revision
+            results = {**previous["results"], **results}
+        history[revision] = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "fixtures": sizes,
+            "results": results,
+        }
+        save_history(args.results, history)
+        print(f"\nresults recorded under {revision} in {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark the Finnhub insider transaction report over a large synthetic history.
+
+Finnhub snapshots repeat the same filings day after day, so a 15-day window
+of a heavily traded name holds thousands of duplicate entries. This compares
+the previous list-based deduplication with the hashed one in
+tradingagents.dataflows.local and checks that both render the same report.
+
+Usage: python -m benchmarks.insider_dedup [--filings 3000] [--days 15]
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from tradingagents.dataflows import local
+from tradingagents.dataflows.config import set_config
+
+TICKER = "BENCH"
+CURR_DATE = "2024-05-10"
+
+
+def make_history(data_dir, filings, days):
+    """Write an insider_trans file where every day repeats most earlier filings."""
+    rng = random.Random(0)
+    unique = [
+        {
+            "name": f"Insider {i % 97}",
+            "share": rng.randint(1_000, 1_000_000),
+            "change": rng.randint(-50_000, 50_000),
+            "filingDate": f"2024-0{rng.randint(1, 5)}-{rng.randint(10, 28)}",
+            "transactionDate": "2024-04-01",
+            "transactionCode": rng.choice("SPMAG"),
+            "transactionPrice": round(rng.uniform(10, 900), 2),
+            "id": f"filing-{i}",
+            "isDerivative": False,
+            "currency": "USD",
+            "source": "S",
+            "symbol": TICKER,
+        }
+        for i in range(filings)
+    ]
+
+    end = datetime.strptime(CURR_DATE, "%Y-%m-%d")
+    history = {}
+    for offset in range(days):
+        day = (end - timedelta(days=offset)).strftime("%Y-%m-%d")
+        history[day] = rng.sample(unique, int(filings * 0.9))
+
+    path = os.path.join(data_dir, "finnhub_data", "insider_trans")
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, f"{TICKER}_data_formatted.json"), "w") as f:
+        json.dump(history, f)
+
+
+def render_with_list_dedup(data):
+    """The previous implementation: membership tests against a list and string +=."""
+    result_str = ""
+    seen_dicts = []
+    for date, senti_list in data.items():
+        for entry in senti_list:
+            if entry not in seen_dicts:
+                result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
+                seen_dicts.append(entry)
+    return result_str
+
+
+def render_with_hashed_dedup(data):
+    return "".join(
+        local._render_insider_transaction(entry)
+        for entry in local._unique_entries(data)
+    )
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filings", type=int, default=3000)
+    parser.add_argument("--days", type=int, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        set_config({"data_dir": tmp, "data_cache_dir": os.path.join(tmp, "cache")})
+        local.DATA_DIR = tmp  # local.py binds DATA_DIR at import time
+
+        make_history(tmp, args.filings, args.days)
+        before = (
+            datetime.strptime(CURR_DATE, "%Y-%m-%d") - timedelta(days=15)
+        ).strftime("%Y-%m-%d")
+        data = local.get_data_in_range(TICKER, before, CURR_DATE, "insider_trans", tmp)
+        entries = sum(len(v) for v in data.values())
+
+        list_time, list_result = timed(render_with_list_dedup, data, repeat=1)
+        hashed_time, hashed_result = timed(render_with_hashed_dedup, data)
+        report_time, report = timed(
+            local.get_finnhub_company_insider_transactions, TICKER, CURR_DATE
+        )
+
+        assert list_result == hashed_result, "hashed dedup changed the report"
+        assert hashed_result in report
+
+        print(f"{entries} entries over {len(data)} days, {args.filings} unique filings")
+        print(f"list dedup:    {list_time * 1000:10.1f} ms")
+        print(f"hashed dedup:  {hashed_time * 1000:10.1f} ms ({list_time / hashed_time:.0f}x)")
+        print(f"full report:   {report_time * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
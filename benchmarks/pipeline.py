@@ -0,0 +1,472 @@
+"""
+Benchmark the full TradingAgentsGraph pipeline offline.
+
+Every LLM is replaced by a scripted chat model that issues canned tool calls
+for each analyst and returns fixed-length reports, and every data tool is
+routed to a "fixture" vendor registered in VENDOR_METHODS that generates
+deterministic data per ticker. Memory embeddings are computed locally. No
+network access or API keys are needed, so the numbers measure the
+framework's own overhead: graph execution, prompt building, tool routing,
+memory lookups and state logging.
+
+Reports end-to-end latency per analysis, time per graph node (from the node
+profiler), peak memory and throughput for N tickers.
+
+Usage: python -m benchmarks.pipeline [--tickers 8] [--concurrency 4] [--parallel-analysts]
+                                    [--llm-latency 0.0] [--vendor-latency 0.0] [--json results.json]
+"""
+
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.dataflows import interface
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+TRADE_DATE = "2024-05-10"
+ANALYSTS = ["market", "social", "news", "fundamentals"]
+INDICATORS = ["close_50_sma", "close_200_sma", "macd", "rsi", "boll_ub", "boll_lb", "atr"]
+
+WORDS = (
+    "revenue margin guidance momentum volatility support resistance breakout "
+    "valuation multiple earnings catalyst sentiment liquidity drawdown upside "
+    "downside exposure hedge rotation inflation yield consensus"
+).split()
+
+
+# Scripted chat model
+
+
+def _days_before(date: str, days: int) -> str:
+    return (datetime.strptime(date, "%Y-%m-%d") - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _analyst_tool_calls(tool_names, ticker, date):
+    """The tool calls each analyst makes, keyed by the first tool it is given."""
+    week_ago = _days_before(date, 7)
+    if tool_names[0] == "get_stock_data":
+        return [
+            ("get_stock_data", {"symbol": ticker, "start_date": _days_before(date, 30), "end_date": date}),
+            ("get_indicators_batch", {"symbol": ticker, "indicators": INDICATORS, "curr_date": date, "look_back_days": 30}),
+        ]
+    if tool_names[0] == "get_fundamentals":
+        return [
+            ("get_fundamentals", {"ticker": ticker, "curr_date": date}),
+            ("get_balance_sheet", {"ticker": ticker, "freq": "quarterly", "curr_date": date}),
+            ("get_cashflow", {"ticker": ticker, "freq": "quarterly", "curr_date": date}),
+            ("get_income_statement", {"ticker": ticker, "freq": "quarterly", "curr_date": date}),
+        ]
+    calls = [("get_news", {"ticker": ticker, "start_date": week_ago, "end_date": date})]
+    if "get_global_news" in tool_names:
+        calls.append(("get_global_news", {"curr_date": date, "look_back_days": 7, "limit": 5}))
+    return calls
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Deterministic stand-in for a chat model. Analysts bound to tools first
+    get their scripted tool calls, then a report once the results are in;
+    every other agent gets a report of report_words words ending in a BUY,
+    HOLD or SELL proposal seeded by its prompt. Token usage is estimated at four
+    characters per token so the node profiler has something to count.
+    """
+
+    latency: float = 0.0
+    report_words: int = 400
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tool_names=[tool.name for tool in tools])
+
+    def _respond(self, messages, tool_names: Optional[List[str]]) -> AIMessage:
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)), "")
+        ticker_match = re.search(r"company we want to look at is (\S+)", system)
+        date_match = re.search(r"current date is (\d{4}-\d{2}-\d{2})", system)
+        ticker = ticker_match.group(1) if ticker_match else "UNKNOWN"
+
+        if "extract the investment decision" in system:
+            text = str(messages[-1].content)
+            decision = re.findall(r"\*\*(BUY|HOLD|SELL)\*\*", text)
+            return AIMessage(content=decision[-1] if decision else "HOLD")
+
+        if tool_names and not any(isinstance(m, ToolMessage) for m in messages):
+            calls = _analyst_tool_calls(tool_names, ticker, date_match.group(1) if date_match else TRADE_DATE)
+            return AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": name, "args": args, "id": f"call_{i}"}
+                    for i, (name, args) in enumerate(calls)
+                ],
+            )
+
+        prompt = "".join(str(m.content) for m in messages)
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        rng = random.Random(digest)
+        body = " ".join(rng.choice(WORDS) for _ in range(self.report_words))
+        decision = rng.choice(("BUY", "HOLD", "SELL"))
+        return AIMessage(content=f"{body}\n\nFINAL TRANSACTION PROPOSAL: **{decision}**")
+
+    def _result(self, messages, message: AIMessage) -> ChatResult:
+        prompt_chars = sum(len(str(m.content)) for m in messages)
+        message.usage_metadata = {
+            "input_tokens": prompt_chars // 4,
+            "output_tokens": len(str(message.content)) // 4 + 10 * len(message.tool_calls),
+            "total_tokens": prompt_chars // 4 + len(str(message.content)) // 4,
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, tool_names=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._result(messages, self._respond(messages, tool_names))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, tool_names=None, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._result(messages, self._respond(messages, tool_names))
+
+
+# Fixture vendors
+
+_vendor_latency = 0.0
+
+
+def _rng(*parts) -> random.Random:
+    return random.Random(hashlib.sha256("|".join(map(str, parts)).encode("utf-8")).digest())
+
+
+def _fixture(fn):
+    def wrapper(*args, **kwargs):
+        if _vendor_latency:
+            time.sleep(_vendor_latency)
+        return fn(*args, **kwargs)
+
+    wrapper.__name__ = fn.__name__
+    wrapper.__qualname__ = fn.__qualname__
+    wrapper.__wrapped__ = fn
+    return wrapper
+
+
+@_fixture
+def fixture_stock_data(symbol, start_date, end_date):
+    rng = _rng(symbol)
+    price = rng.uniform(20, 500)
+    rows = ["Date,Open,High,Low,Close,Volume,Dividends,Stock Splits"]
+    day = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    while day <= end:
+        if day.weekday() < 5:
+            open_ = price
+            price *= 1 + rng.gauss(0, 0.015)
+            high, low = max(open_, price) * 1.01, min(open_, price) * 0.99
+            rows.append(f"{day:%Y-%m-%d},{open_:.2f},{high:.2f},{low:.2f},{price:.2f},{rng.randint(10**6, 10**8)},0.0,0.0")
+        day += timedelta(days=1)
+    return f"# Stock data for {symbol.upper()} from {start_date} to {end_date}\n\n" + "\n".join(rows) + "\n"
+
+
+@_fixture
+def fixture_indicator(symbol, indicator, curr_date, look_back_days):
+    rng = _rng(symbol, indicator)
+    lines = [
+        f"{_days_before(curr_date, offset)}: {rng.uniform(-5, 200):.4f}"
+        for offset in range(look_back_days + 1)
+    ]
+    return f"## {indicator} values from {_days_before(curr_date, look_back_days)} to {curr_date}:\n\n" + "\n".join(lines) + "\n"
+
+
+@_fixture
+def fixture_indicators_batch(symbol, indicators, curr_date, look_back_days):
+    if isinstance(indicators, str):
+        indicators = [i.strip() for i in indicators.split(",") if i.strip()]
+    return "\n\n".join(
+        fixture_indicator.__wrapped__(symbol, indicator, curr_date, look_back_days)
+        for indicator in indicators
+    )
+
+
+@_fixture
+def fixture_fundamentals(ticker, curr_date):
+    rng = _rng(ticker, "fundamentals")
+    fields = ["MarketCapitalization", "PERatio", "PEGRatio", "BookValue", "DividendYield", "EPS", "ProfitMargin", "ReturnOnEquityTTM", "Beta"]
+    return json.dumps({"Symbol": ticker, **{field: f"{rng.uniform(0, 100):.2f}" for field in fields}}, indent=2)
+
+
+def _statement(ticker, kind, freq, curr_date):
+    rng = _rng(ticker, kind, freq)
+    items = ["TotalRevenue", "CostOfRevenue", "GrossProfit", "OperatingIncome", "NetIncome", "TotalAssets", "TotalLiabilities", "CashAndEquivalents", "FreeCashFlow", "CapitalExpenditure"]
+    quarters = [_days_before(curr_date, 91 * (q + 1)) for q in range(4)]
+    rows = [",".join(["item"] + quarters)]
+    rows += [",".join([item] + [str(rng.randint(10**6, 10**10)) for _ in quarters]) for item in items]
+    return f"## {kind} for {ticker} ({freq})\n\n" + "\n".join(rows) + "\n"
+
+
+@_fixture
+def fixture_balance_sheet(ticker, freq="quarterly", curr_date=None):
+    return _statement(ticker, "balance sheet", freq, curr_date or TRADE_DATE)
+
+
+@_fixture
+def fixture_cashflow(ticker, freq="quarterly", curr_date=None):
+    return _statement(ticker, "cash flow", freq, curr_date or TRADE_DATE)
+
+
+@_fixture
+def fixture_income_statement(ticker, freq="quarterly", curr_date=None):
+    return _statement(ticker, "income statement", freq, curr_date or TRADE_DATE)
+
+
+def _articles(seed, count):
+    rng = _rng(*seed)
+    return "".join(
+        f"### {' '.join(rng.choice(WORDS) for _ in range(8)).capitalize()}\n\n"
+        f"{' '.join(rng.choice(WORDS) for _ in range(80))}\n\n"
+        for _ in range(count)
+    )
+
+
+@_fixture
+def fixture_news(ticker, start_date, end_date):
+    return f"## {ticker} News, from {start_date} to {end_date}:\n\n" + _articles((ticker, start_date, end_date), 10)
+
+
+@_fixture
+def fixture_global_news(curr_date, look_back_days=7, limit=5):
+    return f"## Global News, {look_back_days} days before {curr_date}:\n\n" + _articles((curr_date, look_back_days), limit)
+
+
+@_fixture
+def fixture_insider_sentiment(ticker, curr_date):
+    rng = _rng(ticker, "sentiment")
+    return "".join(
+        f"### {_days_before(curr_date, 30 * m)[:7]}:\nChange: {rng.randint(-10**5, 10**5)}\nMonthly Share Purchase Ratio: {rng.uniform(-1, 1):.4f}\n\n"
+        for m in range(6)
+    )
+
+
+@_fixture
+def fixture_insider_transactions(ticker, curr_date):
+    rng = _rng(ticker, "transactions")
+    return "".join(
+        f"### Filing Date: {_days_before(curr_date, rng.randint(1, 90))}, Insider {i}:\nChange:{rng.randint(-50_000, 50_000)}\nShares: {rng.randint(1_000, 10**6)}\nTransaction Price: {rng.uniform(10, 900):.2f}\nTransaction Code: {rng.choice('SPMAG')}\n\n"
+        for i in range(20)
+    )
+
+
+FIXTURE_VENDOR = {
+    "get_stock_data": fixture_stock_data,
+    "get_indicators": fixture_indicator,
+    "get_indicators_batch": fixture_indicators_batch,
+    "get_fundamentals": fixture_fundamentals,
+    "get_balance_sheet": fixture_balance_sheet,
+    "get_cashflow": fixture_cashflow,
+    "get_income_statement": fixture_income_statement,
+    "get_news": fixture_news,
+    "get_global_news": fixture_global_news,
+    "get_insider_sentiment": fixture_insider_sentiment,
+    "get_insider_transactions": fixture_insider_transactions,
+}
+
+
+def register_fixture_vendor():
+    for method, impl in FIXTURE_VENDOR.items():
+        interface.VENDOR_METHODS[method]["fixture"] = impl
+
+
+# Offline embeddings
+
+
+class LocalEmbeddings:
+    """Quacks like the OpenAI client's embeddings endpoint, hashing text into a unit vector."""
+
+    dimensions = 64
+
+    def create(self, model, input):
+        data = []
+        for index, text in enumerate(input):
+            rng = _rng(model, text)
+            vector = [rng.gauss(0, 1) for _ in range(self.dimensions)]
+            norm = sum(v * v for v in vector) ** 0.5
+            data.append(SimpleNamespace(index=index, embedding=[v / norm for v in vector]))
+        return SimpleNamespace(data=data)
+
+
+# Benchmark
+
+
+def build_graph(args, work_dir) -> TradingAgentsGraph:
+    config = dict(DEFAULT_CONFIG)
+    config.update(
+        {
+            "results_dir": os.path.join(work_dir, "results"),
+            "data_cache_dir": os.path.join(work_dir, "cache"),
+            "parallel_analysts": args.parallel_analysts,
+            "max_debate_rounds": args.debate_rounds,
+            "max_risk_discuss_rounds": args.debate_rounds,
+            "data_vendors": {category: "fixture" for category in DEFAULT_CONFIG["data_vendors"]},
+            "tool_vendors": {},
+            "vendor_cache_enabled": not args.no_vendor_cache,
+            "profile_nodes": True,
+        }
+    )
+    if args.debate_budget is not None:
+        config["debate_context_budget"] = args.debate_budget
+    # Only needed to construct the real clients, which are replaced below
+    os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+    graph = TradingAgentsGraph(ANALYSTS, config=config)
+
+    model = ScriptedChatModel(latency=args.llm_latency, report_words=args.report_words)
+    graph.deep_thinking_llm = graph.quick_thinking_llm = model
+    graph.graph_setup.deep_thinking_llm = graph.graph_setup.quick_thinking_llm = model
+    graph.reflector.quick_thinking_llm = model
+    graph.signal_processor.quick_thinking_llm = model
+    graph.graph = graph.graph_setup.setup_graph(ANALYSTS, parallel_analysts=args.parallel_analysts)
+
+    embeddings = SimpleNamespace(embeddings=LocalEmbeddings())
+    for memory in (
+        graph.bull_memory,
+        graph.bear_memory,
+        graph.trader_memory,
+        graph.invest_judge_memory,
+        graph.risk_manager_memory,
+    ):
+        memory.client = embeddings
+    return graph
+
+
+def node_times(work_dir) -> dict:
+    """Sum the per-node profiles of every run in work_dir."""
+    totals = {}
+    pattern = os.path.join(work_dir, "eval_results", "*", "TradingAgentsStrategy_logs", "node_profile_*.json")
+    for path in glob.glob(pattern):
+        with open(path) as f:
+            nodes = json.load(f)["otherData"]["nodes"]
+        for node, stats in nodes.items():
+            total = totals.setdefault(node, {"calls": 0, "wall_time": 0.0, "prompt_tokens": 0, "completion_tokens": 0})
+            for key in total:
+                total[key] += stats[key]
+    return dict(sorted(totals.items(), key=lambda item: item[1]["wall_time"], reverse=True))
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=8, help="number of synthetic tickers to analyze")
+    parser.add_argument("--concurrency", type=int, default=4, help="max_concurrency for propagate_batch")
+    parser.add_argument("--parallel-analysts", action="store_true")
+    parser.add_argument("--debate-rounds", type=int, default=1)
+    parser.add_argument("--debate-budget", type=int, help="debate_context_budget in tokens, 0 for unbounded (default: the config's)")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds each scripted LLM call sleeps")
+    parser.add_argument("--vendor-latency", type=float, default=0.0, help="seconds each fixture vendor call sleeps")
+    parser.add_argument("--report-words", type=int, default=400, help="words per scripted report")
+    parser.add_argument("--no-vendor-cache", action="store_true")
+    parser.add_argument("--tracemalloc", action="store_true", help="also report the Python heap peak (slower)")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    global _vendor_latency
+    _vendor_latency = args.vendor_latency
+    register_fixture_vendor()
+    tickers = [f"T{i:03d}" for i in range(args.tickers)]
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        # State logs and node profiles are written under the working directory
+        os.chdir(work_dir)
+        try:
+            graph = build_graph(args, work_dir)
+            graph.propagate("WARMUP", TRADE_DATE)
+            shutil.rmtree(os.path.join(work_dir, "eval_results", "WARMUP"), ignore_errors=True)
+
+            if args.tracemalloc:
+                tracemalloc.start()
+            start = time.perf_counter()
+            results = list(graph.propagate_batch(tickers, [TRADE_DATE], max_concurrency=args.concurrency))
+            elapsed = time.perf_counter() - start
+            heap_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024) if args.tracemalloc else None
+            if args.tracemalloc:
+                tracemalloc.stop()
+
+            nodes = node_times(work_dir)
+        finally:
+            os.chdir(cwd)
+
+    errors = [r for r in results if r["error"] is not None]
+    latencies = sorted(r["elapsed"] for r in results if r["error"] is None)
+    summary = {
+        "tickers": args.tickers,
+        "concurrency": args.concurrency,
+        "parallel_analysts": args.parallel_analysts,
+        "llm_latency": args.llm_latency,
+        "vendor_latency": args.vendor_latency,
+        "errors": len(errors),
+        "total_seconds": elapsed,
+        "throughput_per_minute": len(results) / elapsed * 60,
+        "latency_mean": statistics.mean(latencies) if latencies else None,
+        "latency_p50": latencies[len(latencies) // 2] if latencies else None,
+        "latency_max": latencies[-1] if latencies else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "heap_peak_mb": heap_peak,
+        "decisions": {r["ticker"]: r["decision"] for r in results},
+        "nodes": nodes,
+    }
+
+    print(f"{len(results)} analyses ({len(errors)} failed) in {elapsed:.2f}s, concurrency {args.concurrency}"
+          f"{', parallel analysts' if args.parallel_analysts else ''}")
+    if latencies:
+        print(f"latency:     mean {summary['latency_mean']:.3f}s  p50 {summary['latency_p50']:.3f}s  max {summary['latency_max']:.3f}s")
+    print(f"throughput:  {summary['throughput_per_minute']:.1f} analyses/min")
+    if summary["peak_rss_mb"] is not None:
+        print(f"peak RSS:    {summary['peak_rss_mb']:.0f} MB")
+    if heap_peak is not None:
+        print(f"heap peak:   {heap_peak:.1f} MB")
+    print(f"\n{'node':45} {'calls':>6} {'total s':>9} {'mean ms':>9} {'tokens in':>10} {'out':>8}")
+    for node, stats in nodes.items():
+        mean_ms = stats["wall_time"] / stats["calls"] * 1000 if stats["calls"] else 0.0
+        print(f"{node:45} {stats['calls']:6d} {stats['wall_time']:9.3f} {mean_ms:9.1f} "
+              f"{stats['prompt_tokens']:10d} {stats['completion_tokens']:8d}")
+    for result in errors:
+        print(f"FAILED {result['ticker']}: {result['error']!r}")
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
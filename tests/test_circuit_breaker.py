@@ -0,0 +1,83 @@
+import unittest
+from unittest import mock
+
+import requests
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows.circuit_breaker import (
+    CLOSED,
+    OPEN,
+    get_circuit_breaker,
+    is_vendor_failure,
+    reset_circuit_breakers,
+)
+from tradingagents.dataflows.config import get_config, set_config
+
+VENDORS = ("alpha_vantage", "yfinance", "local")
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.exceptions.HTTPError(f"{status} error", response=response)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        config = get_config()
+        self.saved = {
+            key: config.get(key)
+            for key in ("tool_vendors", "vendor_cache_enabled", "vendor_circuit_breaker", "vendor_breaker_failure_threshold")
+        }
+        set_config({"vendor_cache_enabled": False, "vendor_circuit_breaker": True, "vendor_breaker_failure_threshold": 5})
+        reset_circuit_breakers()
+
+    def tearDown(self):
+        set_config(self.saved)
+        reset_circuit_breakers()
+
+    def test_unsupported_indicator_does_not_open_circuits(self):
+        # Every vendor rejects the indicator before making a request
+        for _ in range(6):
+            with self.assertRaises(RuntimeError):
+                interface.route_to_vendor("get_indicators", "AAPL", "no_such_indicator", "2024-11-01", 30)
+
+        for vendor in VENDORS:
+            breaker = get_circuit_breaker("get_indicators", vendor)
+            self.assertEqual(breaker.state, CLOSED, vendor)
+            self.assertTrue(breaker.allow(), vendor)
+
+    def test_connection_errors_open_the_circuit(self):
+        def unreachable(*args, **kwargs):
+            raise requests.exceptions.ConnectionError("connection refused")
+
+        def working(*args, **kwargs):
+            return "indicator report"
+
+        vendors = {"alpha_vantage": unreachable, "yfinance": working, "local": working}
+        set_config({"tool_vendors": {"get_indicators": "alpha_vantage"}})
+        with mock.patch.dict(interface.VENDOR_METHODS, {"get_indicators": vendors}):
+            for _ in range(5):
+                interface.route_to_vendor("get_indicators", "AAPL", "rsi", "2024-11-01", 30)
+
+            self.assertEqual(get_circuit_breaker("get_indicators", "alpha_vantage").state, OPEN)
+            self.assertEqual(get_circuit_breaker("get_indicators", "yfinance").state, CLOSED)
+            self.assertIn(
+                "indicator report",
+                interface.route_to_vendor("get_indicators", "AAPL", "rsi", "2024-11-01", 30),
+            )
+
+    def test_is_vendor_failure(self):
+        self.assertTrue(is_vendor_failure(requests.exceptions.ConnectionError()))
+        self.assertTrue(is_vendor_failure(requests.exceptions.ReadTimeout()))
+        self.assertTrue(is_vendor_failure(TimeoutError("no result within 30s")))
+        self.assertTrue(is_vendor_failure(_http_error(429)))
+        self.assertTrue(is_vendor_failure(_http_error(503)))
+        self.assertFalse(is_vendor_failure(_http_error(404)))
+        self.assertFalse(is_vendor_failure(ValueError("Indicator foo is not supported")))
+        self.assertFalse(is_vendor_failure(FileNotFoundError("AAPL-YFin-data.csv")))
+        self.assertFalse(is_vendor_failure(KeyError("close")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 from tradingagents.agents.utils.agent_utils import get_fundamentals, get_balance_sheet, get_cashflow, get_income_statement, get_insider_sentiment, get_insider_transactions
@@ -6,7 +7,7 @@ from tradingagents.dataflows.config import get_config
 
 
 def create_fundamentals_analyst(llm):
-    def fundamentals_analyst_node(state):
+    def build_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
@@ -46,10 +47,9 @@ def create_fundamentals_analyst(llm):
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
-        chain = prompt | llm.bind_tools(tools)
-
-        result = chain.invoke(state["messages"])
+        return prompt | llm.bind_tools(tools)
 
+    def to_update(result):
         report = ""
 
         if len(result.tool_calls) == 0:
@@ -60,4 +60,12 @@ def create_fundamentals_analyst(llm):
             "fundamentals_report": report,
         }
 
-    return fundamentals_analyst_node
+    def fundamentals_analyst_node(state):
+        result = build_chain(state).invoke(state["messages"])
+        return to_update(result)
+
+    async def afundamentals_analyst_node(state):
+        result = await build_chain(state).ainvoke(state["messages"])
+        return to_update(result)
+
+    return RunnableLambda(fundamentals_analyst_node, afunc=afundamentals_analyst_node)
@@ -1,19 +1,18 @@
 import time
 import json
+from langchain_core.runnables import RunnableLambda
 
 
 def create_research_manager(llm, memory):
-    def research_manager_node(state) -> dict:
-        history = state["investment_debate_state"].get("history", "")
+    def get_situation(state) -> str:
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
         news_report = state["news_report"]
         fundamentals_report = state["fundamentals_report"]
+        return f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
 
-        investment_debate_state = state["investment_debate_state"]
-
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+    def build_prompt(state, past_memories) -> str:
+        history = state["investment_debate_state"].get("history", "")
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
@@ -36,7 +35,10 @@ Here are your past reflections on mistakes:
 Here is the debate:
 Debate History:
 {history}"""
-        response = llm.invoke(prompt)
+        return prompt
+
+    def update_state(state, response) -> dict:
+        investment_debate_state = state["investment_debate_state"]
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -52,4 +54,14 @@ Debate History:
             "investment_plan": response.content,
         }
 
-    return research_manager_node
+    def research_manager_node(state) -> dict:
+        past_memories = memory.get_memories(get_situation(state), n_matches=2)
+        response = llm.invoke(build_prompt(state, past_memories))
+        return update_state(state, response)
+
+    async def aresearch_manager_node(state) -> dict:
+        past_memories = await memory.aget_memories(get_situation(state), n_matches=2)
+        response = await llm.ainvoke(build_prompt(state, past_memories))
+        return update_state(state, response)
+
+    return RunnableLambda(research_manager_node, afunc=aresearch_manager_node)
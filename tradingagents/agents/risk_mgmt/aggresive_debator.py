@@ -1,20 +1,29 @@
 import time
 import json
+from langchain_core.runnables import RunnableLambda
+
+from tradingagents.agents.utils.debate_context import build_debate_context
 
 
 def create_risky_debator(llm):
-    def risky_node(state) -> dict:
+    def build_prompt(state) -> str:
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
         risky_history = risk_debate_state.get("risky_history", "")
 
         current_safe_response = risk_debate_state.get("current_safe_response", "")
         current_neutral_response = risk_debate_state.get("current_neutral_response", "")
 
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+        context = build_debate_context(
+            state,
+            risk_debate_state,
+            "Risky Analyst",
+            [current_safe_response, current_neutral_response],
+        )
+        history = context.history
+        market_research_report = context.market_report
+        sentiment_report = context.sentiment_report
+        news_report = context.news_report
+        fundamentals_report = context.fundamentals_report
 
         trader_decision = state["trader_investment_plan"]
 
@@ -32,7 +41,12 @@ Here is the current conversation history: {history} Here are the last arguments
 
 Engage actively by addressing any specific concerns raised, refuting the weaknesses in their logic, and asserting the benefits of risk-taking to outpace market norms. Maintain a focus on debating and persuading, not just presenting data. Challenge each counterpoint to underscore why a high-risk approach is optimal. Output conversationally as if you are speaking without any special formatting."""
 
-        response = llm.invoke(prompt)
+        return prompt
+
+    def update_state(state, response) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        risky_history = risk_debate_state.get("risky_history", "")
 
         argument = f"Risky Analyst: {response.content}"
 
@@ -52,4 +66,12 @@ Engage actively by addressing any specific concerns raised, refuting the weaknes
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return risky_node
+    def risky_node(state) -> dict:
+        response = llm.invoke(build_prompt(state))
+        return update_state(state, response)
+
+    async def arisky_node(state) -> dict:
+        response = await llm.ainvoke(build_prompt(state))
+        return update_state(state, response)
+
+    return RunnableLambda(risky_node, afunc=arisky_node)
@@ -1,21 +1,30 @@
 from langchain_core.messages import AIMessage
 import time
 import json
+from langchain_core.runnables import RunnableLambda
+
+from tradingagents.agents.utils.debate_context import build_debate_context
 
 
 def create_safe_debator(llm):
-    def safe_node(state) -> dict:
+    def build_prompt(state) -> str:
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
         safe_history = risk_debate_state.get("safe_history", "")
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
         current_neutral_response = risk_debate_state.get("current_neutral_response", "")
 
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+        context = build_debate_context(
+            state,
+            risk_debate_state,
+            "Safe Analyst",
+            [current_risky_response, current_neutral_response],
+        )
+        history = context.history
+        market_research_report = context.market_report
+        sentiment_report = context.sentiment_report
+        news_report = context.news_report
+        fundamentals_report = context.fundamentals_report
 
         trader_decision = state["trader_investment_plan"]
 
@@ -33,7 +42,12 @@ Here is the current conversation history: {history} Here is the last response fr
 
 Engage by questioning their optimism and emphasizing the potential downsides they may have overlooked. Address each of their counterpoints to showcase why a conservative stance is ultimately the safest path for the firm's assets. Focus on debating and critiquing their arguments to demonstrate the strength of a low-risk strategy over their approaches. Output conversationally as if you are speaking without any special formatting."""
 
-        response = llm.invoke(prompt)
+        return prompt
+
+    def update_state(state, response) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        safe_history = risk_debate_state.get("safe_history", "")
 
         argument = f"Safe Analyst: {response.content}"
 
@@ -55,4 +69,12 @@ Engage by questioning their optimism and emphasizing the potential downsides the
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return safe_node
+    def safe_node(state) -> dict:
+        response = llm.invoke(build_prompt(state))
+        return update_state(state, response)
+
+    async def asafe_node(state) -> dict:
+        response = await llm.ainvoke(build_prompt(state))
+        return update_state(state, response)
+
+    return RunnableLambda(safe_node, afunc=asafe_node)
@@ -1,20 +1,29 @@
 import time
 import json
+from langchain_core.runnables import RunnableLambda
+
+from tradingagents.agents.utils.debate_context import build_debate_context
 
 
 def create_neutral_debator(llm):
-    def neutral_node(state) -> dict:
+    def build_prompt(state) -> str:
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
         neutral_history = risk_debate_state.get("neutral_history", "")
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
         current_safe_response = risk_debate_state.get("current_safe_response", "")
 
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+        context = build_debate_context(
+            state,
+            risk_debate_state,
+            "Neutral Analyst",
+            [current_risky_response, current_safe_response],
+        )
+        history = context.history
+        market_research_report = context.market_report
+        sentiment_report = context.sentiment_report
+        news_report = context.news_report
+        fundamentals_report = context.fundamentals_report
 
         trader_decision = state["trader_investment_plan"]
 
@@ -32,7 +41,12 @@ Here is the current conversation history: {history} Here is the last response fr
 
 Engage actively by analyzing both sides critically, addressing weaknesses in the risky and conservative arguments to advocate for a more balanced approach. Challenge each of their points to illustrate why a moderate risk strategy might offer the best of both worlds, providing growth potential while safeguarding against extreme volatility. Focus on debating rather than simply presenting data, aiming to show that a balanced view can lead to the most reliable outcomes. Output conversationally as if you are speaking without any special formatting."""
 
-        response = llm.invoke(prompt)
+        return prompt
+
+    def update_state(state, response) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        neutral_history = risk_debate_state.get("neutral_history", "")
 
         argument = f"Neutral Analyst: {response.content}"
 
@@ -52,4 +66,12 @@ Engage actively by analyzing both sides critically, addressing weaknesses in the
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return neutral_node
+    def neutral_node(state) -> dict:
+        response = llm.invoke(build_prompt(state))
+        return update_state(state, response)
+
+    async def aneutral_node(state) -> dict:
+        response = await llm.ainvoke(build_prompt(state))
+        return update_state(state, response)
+
+    return RunnableLambda(neutral_node, afunc=aneutral_node)
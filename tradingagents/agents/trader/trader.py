@@ -1,19 +1,20 @@
 import functools
 import time
 import json
+from langchain_core.runnables import RunnableLambda
 
 
 def create_trader(llm, memory):
-    def trader_node(state, name):
-        company_name = state["company_of_interest"]
-        investment_plan = state["investment_plan"]
+    def get_situation(state) -> str:
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
         news_report = state["news_report"]
         fundamentals_report = state["fundamentals_report"]
+        return f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+    def build_messages(state, past_memories) -> list:
+        company_name = state["company_of_interest"]
+        investment_plan = state["investment_plan"]
 
         past_memory_str = ""
         if past_memories:
@@ -35,7 +36,21 @@ def create_trader(llm, memory):
             context,
         ]
 
-        result = llm.invoke(messages)
+        return messages
+
+    def trader_node(state, name):
+        past_memories = memory.get_memories(get_situation(state), n_matches=2)
+        result = llm.invoke(build_messages(state, past_memories))
+
+        return {
+            "messages": [result],
+            "trader_investment_plan": result.content,
+            "sender": name,
+        }
+
+    async def atrader_node(state, name):
+        past_memories = await memory.aget_memories(get_situation(state), n_matches=2)
+        result = await llm.ainvoke(build_messages(state, past_memories))
 
         return {
             "messages": [result],
@@ -43,4 +58,7 @@ def create_trader(llm, memory):
             "sender": name,
         }
 
-    return functools.partial(trader_node, name="Trader")
+    return RunnableLambda(
+        functools.partial(trader_node, name="Trader"),
+        afunc=functools.partial(atrader_node, name="Trader"),
+    )
@@ -0,0 +1,198 @@
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+from tradingagents.dataflows.config import get_config
+
+# Shares of debate_context_budget for the report digests and the summary of
+# older turns; the most recent turns get the rest
+REPORT_SHARE = 0.5
+SUMMARY_SHARE = 0.2
+# Fewer tokens than this per summarized turn would say nothing useful
+MIN_TURN_SUMMARY_TOKENS = 24
+# Budget of debate_context_budget "auto" once a debate has more than one round,
+# where the history would otherwise grow with every turn
+AUTO_CONTEXT_BUDGET = 6000
+
+REPORTS = (
+    ("market_report", "Market research report"),
+    ("sentiment_report", "Social media sentiment report"),
+    ("news_report", "World affairs news report"),
+    ("fundamentals_report", "Company fundamentals report"),
+)
+
+# Every debate turn is stored as "<Speaker> Analyst: <argument>"
+_TURN_START = re.compile(r"^(?=(?:Bull|Bear|Risky|Safe|Neutral) Analyst: )", re.MULTILINE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_CUT = " [...]"
+
+
+class DebateContext(NamedTuple):
+    market_report: str
+    sentiment_report: str
+    news_report: str
+    fundamentals_report: str
+    history: str
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, about four characters per token for English text."""
+    return (len(text) + 3) // 4
+
+
+def _sentences(block: str) -> List[str]:
+    """
+    A paragraph as a list of units: its heading, then its sentences, or its
+    table rows with the header row and its separator as one unit.
+    """
+    lines = [line.strip() for line in block.strip().splitlines() if line.strip()]
+    heading = [lines.pop(0)] if lines[0].startswith("#") else []
+    if lines and lines[0].startswith("|"):
+        header_rows = 2 if len(lines) > 1 and set(lines[1]) <= set("|-: ") else 1
+        return heading + ["\n".join(lines[:header_rows])] + lines[header_rows:]
+    rest = " ".join(" ".join(lines).split())
+    return heading + (_SENTENCE_END.split(rest) if rest else [])
+
+
+def _join(units: List[str]) -> str:
+    """Units back as text: headings and table rows on their own lines, sentences run on."""
+    text = units[0]
+    for previous, unit in zip(units, units[1:]):
+        separator = "\n" if previous.startswith(("#", "|")) or unit.startswith("|") else " "
+        text += separator + unit
+    return text
+
+
+def condense(text: str, max_tokens: int) -> str:
+    """
+    Shorten text to about max_tokens, keeping its headings and the first
+    sentence or table header of each paragraph, then as many further
+    sentences and table rows, in order, as fit. Text that fits is returned
+    as is.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # In characters, leaving room for the cut marker
+    budget = max(0, max_tokens * 4 - len(_CUT))
+    paragraphs = [_sentences(block) for block in re.split(r"\n\s*\n", text.strip()) if block.strip()]
+    taken = [0] * len(paragraphs)
+    used = 0
+
+    for i, units in enumerate(paragraphs):
+        if used + len(units[0]) + 1 <= budget:
+            taken[i] = 1
+            used += len(units[0]) + 1
+
+    for i, units in enumerate(paragraphs):
+        if not taken[i]:
+            continue
+        while taken[i] < len(units) and used + len(units[taken[i]]) + 1 <= budget:
+            used += len(units[taken[i]]) + 1
+            taken[i] += 1
+        if taken[i] < len(units):
+            break
+
+    if not any(taken):
+        return text[:budget].rstrip() + _CUT
+    kept = [_join(units[:n]) for units, n in zip(paragraphs, taken) if n]
+    return "\n".join(kept) + _CUT
+
+
+def split_turns(history: str) -> List[str]:
+    """The turns of a debate history string, oldest first."""
+    return [turn.strip() for turn in _TURN_START.split(history) if turn.strip()]
+
+
+@lru_cache(maxsize=128)
+def _report_digest(label: str, report: str, max_tokens: int) -> str:
+    header = f"[Excerpt of the {label.lower()}, shortened to its key points; not the full report:]\n"
+    return header + condense(report, max_tokens - estimate_tokens(header))
+
+
+def _history_section(turns: List[str], summary_tokens: int, recent_tokens: int, recent_turns: int) -> str:
+    """The older turns summarized within summary_tokens and the recent ones condensed within recent_tokens."""
+    recent = turns[-recent_turns:] if recent_turns > 0 else []
+    older = turns[: len(turns) - len(recent)]
+    parts = []
+
+    if older:
+        # The header comes out of the summary budget, counted at its longest
+        available = summary_tokens - estimate_tokens(
+            f"Summary of earlier turns ({len(older)} oldest not shown):\n\n\n"
+        )
+        per_turn = max(MIN_TURN_SUMMARY_TOKENS, available // len(older))
+        # Newest summaries first until the budget is spent
+        kept = []
+        used = 0
+        for turn in reversed(older):
+            summary = condense(turn, per_turn)
+            used += estimate_tokens(summary + "\n")
+            if used > available:
+                break
+            kept.append(summary)
+        omitted = len(older) - len(kept)
+        if kept:
+            header = "Summary of earlier turns"
+            if omitted:
+                header += f" ({omitted} oldest not shown)"
+            parts.append(header + ":\n" + "\n".join(reversed(kept)))
+        else:
+            parts.append(f"({omitted} earlier turns not shown)")
+
+    if recent:
+        # Each turn also takes a line break
+        per_turn = recent_tokens // len(recent) - 1
+        parts.append("\n".join(condense(turn, per_turn) for turn in recent))
+
+    return "\n\n".join(parts)
+
+
+def build_debate_context(
+    state,
+    debate_state: dict,
+    speaker: str,
+    latest_responses: Optional[List[str]] = None,
+) -> DebateContext:
+    """
+    Reports and debate history for a debater's prompt.
+
+    Without a debate_context_budget in the config these are the full reports
+    and history; "auto" applies AUTO_CONTEXT_BUDGET to debates of more than
+    one round. With a budget, prompts stay bounded however many rounds are
+    debated: the reports are given in full only in the speaker's opening
+    argument and afterwards as digests, and the history is a summary of the
+    older turns plus the last debate_recent_turns turns. Turns in
+    latest_responses are left out, as the prompt quotes them on its own.
+    """
+    reports = [state[key] for key, _ in REPORTS]
+    history = debate_state.get("history", "")
+
+    config = get_config()
+    budget = config.get("debate_context_budget", "auto")
+    if budget == "auto":
+        rounds = config.get(
+            "max_debate_rounds" if speaker in ("Bull Analyst", "Bear Analyst") else "max_risk_discuss_rounds", 1
+        )
+        budget = AUTO_CONTEXT_BUDGET if rounds > 1 else None
+    if not budget:
+        return DebateContext(*reports, history)
+
+    all_turns = split_turns(history)
+    latest = {response.strip() for response in latest_responses or [] if response}
+    turns = [turn for turn in all_turns if turn not in latest]
+
+    opening = not any(turn.startswith(f"{speaker}:") for turn in all_turns)
+    if not opening:
+        per_report = int(budget * REPORT_SHARE) // len(REPORTS)
+        reports = [
+            _report_digest(label, report, per_report) if report else report
+            for (_, label), report in zip(REPORTS, reports)
+        ]
+
+    summary_tokens = int(budget * SUMMARY_SHARE)
+    recent_tokens = budget - int(budget * REPORT_SHARE) - summary_tokens
+    history = _history_section(
+        turns, summary_tokens, recent_tokens, config.get("debate_recent_turns", 2)
+    )
+    return DebateContext(*reports, history)
@@ -1,7 +1,24 @@
+import os
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
 import chromadb
 from chromadb.config import Settings
 from openai import OpenAI
 
+# Maximum number of embedding vectors kept in the shared cache
+MAX_CACHED_EMBEDDINGS = 1024
+
+# Embeddings shared by every memory in the process, keyed by model and text digest.
+# The agents of one run all embed the same situation, so only the first pays for it.
+_embedding_cache = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+
+def _embedding_key(model, text):
+    return (model, hashlib.sha256(text.encode("utf-8")).hexdigest())
+
 
 class FinancialSituationMemory:
     def __init__(self, name, config):
@@ -10,16 +27,65 @@ class FinancialSituationMemory:
         else:
             self.embedding = "text-embedding-3-small"
         self.client = OpenAI(base_url=config["backend_url"])
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        self.situation_collection = self.chroma_client.create_collection(name=name)
+        self.batch_size = config.get("embedding_batch_size", 256)
+
+        memory_dir = config.get("memory_dir")
+        if memory_dir:
+            # Each memory keeps its documents and their embedding vectors in
+            # its own directory and picks them up again on the next start
+            self.chroma_client = chromadb.PersistentClient(
+                path=os.path.join(memory_dir, name), settings=Settings(allow_reset=True)
+            )
+            self.situation_collection = self.chroma_client.get_or_create_collection(
+                name=name, metadata={"embedding_model": self.embedding}
+            )
+            stored_model = (self.situation_collection.metadata or {}).get("embedding_model")
+            if stored_model != self.embedding:
+                raise ValueError(
+                    f"Memory '{name}' in {memory_dir} was built with embedding model "
+                    f"'{stored_model}', not '{self.embedding}'; use another memory_dir."
+                )
+        else:
+            self.chroma_client = chromadb.Client(Settings(allow_reset=True))
+            self.situation_collection = self.chroma_client.create_collection(name=name)
 
     def get_embedding(self, text):
         """Get OpenAI embedding for a text"""
-        
-        response = self.client.embeddings.create(
-            model=self.embedding, input=text
-        )
-        return response.data[0].embedding
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts):
+        """Get OpenAI embeddings for several texts, requesting only uncached ones, batch_size per call"""
+        keys = [_embedding_key(self.embedding, text) for text in texts]
+
+        embeddings = {}
+        with _embedding_cache_lock:
+            for key in keys:
+                if key in _embedding_cache:
+                    _embedding_cache.move_to_end(key)
+                    embeddings[key] = _embedding_cache[key]
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in embeddings:
+                missing.setdefault(key, text)
+
+        missing_keys = list(missing)
+        for start in range(0, len(missing_keys), self.batch_size):
+            batch = missing_keys[start : start + self.batch_size]
+            response = self.client.embeddings.create(
+                model=self.embedding, input=[missing[key] for key in batch]
+            )
+
+            with _embedding_cache_lock:
+                for item in response.data:
+                    key = batch[item.index]
+                    embeddings[key] = item.embedding
+                    _embedding_cache[key] = item.embedding
+                    _embedding_cache.move_to_end(key)
+                while len(_embedding_cache) > MAX_CACHED_EMBEDDINGS:
+                    _embedding_cache.popitem(last=False)
+
+        return [embeddings[key] for key in keys]
 
     def add_situations(self, situations_and_advice):
         """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
@@ -27,7 +93,6 @@ class FinancialSituationMemory:
         situations = []
         advice = []
         ids = []
-        embeddings = []
 
         offset = self.situation_collection.count()
 
@@ -35,7 +100,8 @@ class FinancialSituationMemory:
             situations.append(situation)
             advice.append(recommendation)
             ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+
+        embeddings = self.get_embeddings(situations)
 
         self.situation_collection.add(
             documents=situations,
@@ -66,6 +132,10 @@ class FinancialSituationMemory:
 
         return matched_results
 
+    async def aget_memories(self, current_situation, n_matches=1):
+        """Async variant of get_memories; the embedding request and query run in a worker thread"""
+        return await asyncio.to_thread(self.get_memories, current_situation, n_matches)
+
 
 if __name__ == "__main__":
     # Example usage
@@ -1,12 +1,34 @@
 import os
+import logging
+import time
+import threading
 import requests
 import pandas as pd
 import json
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from io import StringIO
+from requests.adapters import HTTPAdapter
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
 
 API_BASE_URL = "https://www.alphavantage.co/query"
 
+# Shared HTTP client state, created lazily and rebuilt when its settings change
+_client_lock = threading.Lock()
+_session = None
+_session_pool_size = None
+_rate_limiter = None
+_rate_limiter_rpm = None
+_executor = None
+_executor_workers = None
+
+# Identical requests currently on the wire, keyed by their query parameters
+_inflight = {}
+_inflight_lock = threading.Lock()
+
 def get_api_key() -> str:
     """Retrieve the API key for Alpha Vantage from environment variables."""
     api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
@@ -39,9 +61,96 @@ class AlphaVantageRateLimitError(Exception):
     """Exception raised when Alpha Vantage API rate limit is exceeded."""
     pass
 
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at ``requests_per_minute``.
+
+    Callers reserve a token and sleep until it is due, so concurrent callers
+    queue in arrival order instead of all sending at once. A bucket of one
+    token spaces requests evenly, which keeps any 60 second window within the
+    plan's limit.
+    """
+
+    def __init__(self, requests_per_minute: float, capacity: float = 1):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: float = None) -> bool:
+        """Take a token, waiting for it if needed. Returns False instead of waiting longer than max_wait."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return False
+            # Reserve the token now; a negative balance is the queue ahead of later callers
+            self.tokens -= 1
+
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+
+def _get_session() -> requests.Session:
+    """Get the pooled HTTP session shared by all Alpha Vantage requests."""
+    global _session, _session_pool_size
+
+    pool_size = max(10, get_config().get("alpha_vantage_max_workers", 4))
+    with _client_lock:
+        if _session is None or _session_pool_size != pool_size:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_maxsize=pool_size))
+            _session, _session_pool_size = session, pool_size
+        return _session
+
+
+def _get_rate_limiter():
+    """Get the token bucket for the configured requests per minute, or None when unlimited."""
+    global _rate_limiter, _rate_limiter_rpm
+
+    rpm = get_config().get("alpha_vantage_requests_per_minute")
+    if not rpm:
+        return None
+    with _client_lock:
+        if _rate_limiter is None or _rate_limiter_rpm != rpm:
+            _rate_limiter, _rate_limiter_rpm = TokenBucket(rpm), rpm
+        return _rate_limiter
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor, _executor_workers
+
+    workers = get_config().get("alpha_vantage_max_workers", 4)
+    with _client_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="alpha_vantage"
+            )
+            _executor_workers = workers
+        return _executor
+
+
+def map_parallel(func, items) -> list:
+    """
+    Apply func to every item on the bounded Alpha Vantage worker pool and
+    return the results in order. func must not itself call map_parallel.
+    """
+    return list(_get_executor().map(func, items))
+
+
 def _make_api_request(function_name: str, params: dict) -> dict | str:
     """Helper function to make API requests and handle responses.
-    
+
+    Identical requests already in flight share a single HTTP call.
+
     Raises:
         AlphaVantageRateLimitError: When API rate limit is exceeded
     """
@@ -63,7 +172,47 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
         # Remove entitlement if it's None or empty
         api_params.pop("entitlement", None)
     
-    response = requests.get(API_BASE_URL, params=api_params)
+    key = tuple(sorted(api_params.items()))
+    with _inflight_lock:
+        pending = _inflight.get(key)
+        if pending is None:
+            pending = Future()
+            _inflight[key] = pending
+            leader = True
+        else:
+            leader = False
+
+    if not leader:
+        return pending.result()
+
+    try:
+        result = _send_request(api_params)
+    except BaseException as e:
+        pending.set_exception(e)
+        raise
+    else:
+        pending.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _send_request(api_params: dict) -> str:
+    config = get_config()
+
+    rate_limiter = _get_rate_limiter()
+    if rate_limiter is not None and not rate_limiter.acquire(
+        config.get("alpha_vantage_max_wait", 30)
+    ):
+        # Queueing any longer would be slower than falling back to another vendor
+        raise AlphaVantageRateLimitError(
+            "Alpha Vantage request queue is full for the configured requests per minute"
+        )
+
+    response = _get_session().get(
+        API_BASE_URL, params=api_params, timeout=config.get("alpha_vantage_timeout", 30)
+    )
     response.raise_for_status()
 
     response_text = response.text
@@ -76,6 +225,9 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
             info_message = response_json["Information"]
             if "rate limit" in info_message.lower() or "api key" in info_message.lower():
                 raise AlphaVantageRateLimitError(f"Alpha Vantage rate limit exceeded: {info_message}")
+        # Older plans send the per-minute limit notice as a "Note"
+        if "Note" in response_json:
+            raise AlphaVantageRateLimitError(f"Alpha Vantage rate limit exceeded: {response_json['Note']}")
     except json.JSONDecodeError:
         # Response is not JSON (likely CSV data), which is normal
         pass
@@ -118,5 +270,5 @@ def _filter_csv_by_date_range(csv_data: str, start_date: str, end_date: str) ->
 
     except Exception as e:
         # If filtering fails, return original data with a warning
-        print(f"Warning: Failed to filter CSV data by date range: {e}")
+        logger.warning("Failed to filter CSV data by date range: %s", e)
         return csv_data
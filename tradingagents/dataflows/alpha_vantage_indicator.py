@@ -1,4 +1,38 @@
-from .alpha_vantage_common import _make_api_request
+import logging
+from functools import lru_cache
+
+from .alpha_vantage_common import map_parallel
+from .alpha_vantage_series import get_series
+
+logger = logging.getLogger(__name__)
+
+# Alpha Vantage function, CSV column and extra parameters behind each indicator.
+# A None parameter takes the caller's time_period.
+INDICATOR_SOURCES = {
+    "close_50_sma": ("SMA", "SMA", {"time_period": "50"}),
+    "close_200_sma": ("SMA", "SMA", {"time_period": "200"}),
+    "close_10_ema": ("EMA", "EMA", {"time_period": "10"}),
+    "macd": ("MACD", "MACD", {}),
+    "macds": ("MACD", "MACD_Signal", {}),
+    "macdh": ("MACD", "MACD_Hist", {}),
+    "rsi": ("RSI", "RSI", {"time_period": None}),
+    "boll": ("BBANDS", "Real Middle Band", {"time_period": "20"}),
+    "boll_ub": ("BBANDS", "Real Upper Band", {"time_period": "20"}),
+    "boll_lb": ("BBANDS", "Real Lower Band", {"time_period": "20"}),
+    "atr": ("ATR", "ATR", {"time_period": None}),
+}
+
+
+@lru_cache(maxsize=32)
+def _parse_table(data: str):
+    """Split a CSV response into its header and rows once for all of its columns."""
+    lines = data.strip().split('\n')
+    if len(lines) < 2:
+        return None
+    header = [col.strip() for col in lines[0].split(',')]
+    rows = tuple(line.split(',') for line in lines[1:] if line.strip())
+    return header, rows
+
 
 def get_indicator(
     symbol: str,
@@ -72,119 +106,40 @@ def get_indicator(
     if required_series_type:
         series_type = required_series_type
 
+    if indicator == "vwma":
+        # Alpha Vantage doesn't have direct VWMA, so we'll return an informative message
+        # In a real implementation, this would need to be calculated from OHLCV data
+        return f"## VWMA (Volume Weighted Moving Average) for {symbol}:\n\nVWMA calculation requires OHLCV data and is not directly available from Alpha Vantage API.\nThis indicator would need to be calculated from the raw stock data using volume-weighted price averaging.\n\n{indicator_descriptions.get('vwma', 'No description available.')}"
+
     try:
-        # Get indicator data for the period
-        if indicator == "close_50_sma":
-            data = _make_api_request("SMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "50",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "close_200_sma":
-            data = _make_api_request("SMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "200",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "close_10_ema":
-            data = _make_api_request("EMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "10",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macd":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macds":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macdh":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "rsi":
-            data = _make_api_request("RSI", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": str(time_period),
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator in ["boll", "boll_ub", "boll_lb"]:
-            data = _make_api_request("BBANDS", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "20",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "atr":
-            data = _make_api_request("ATR", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": str(time_period),
-                "datatype": "csv"
-            })
-        elif indicator == "vwma":
-            # Alpha Vantage doesn't have direct VWMA, so we'll return an informative message
-            # In a real implementation, this would need to be calculated from OHLCV data
-            return f"## VWMA (Volume Weighted Moving Average) for {symbol}:\n\nVWMA calculation requires OHLCV data and is not directly available from Alpha Vantage API.\nThis indicator would need to be calculated from the raw stock data using volume-weighted price averaging.\n\n{indicator_descriptions.get('vwma', 'No description available.')}"
-        else:
-            return f"Error: Indicator {indicator} not implemented yet."
-
-        # Parse CSV data and extract values for the date range
-        lines = data.strip().split('\n')
-        if len(lines) < 2:
-            return f"Error: No data returned for {indicator}"
-
-        # Parse header and data
-        header = [col.strip() for col in lines[0].split(',')]
+        function_name, target_col_name, extra_params = INDICATOR_SOURCES[indicator]
+        params = {"symbol": symbol, "interval": interval, "datatype": "csv"}
+        if required_series_type:
+            params["series_type"] = series_type
+        params.update(
+            (key, str(time_period) if value is None else value)
+            for key, value in extra_params.items()
+        )
+
+        # Indicators sharing a function (MACD, BBANDS) share one cached fetch and parse
+        data = get_series(function_name, params, curr_date)
+        table = _parse_table(data)
+        if table is None:
+            raise ValueError(f"No data returned for {indicator}")
+        header, rows = table
+
         try:
             date_col_idx = header.index('time')
         except ValueError:
-            return f"Error: 'time' column not found in data for {indicator}. Available columns: {header}"
-
-        # Map internal indicator names to expected CSV column names from Alpha Vantage
-        col_name_map = {
-            "macd": "MACD", "macds": "MACD_Signal", "macdh": "MACD_Hist",
-            "boll": "Real Middle Band", "boll_ub": "Real Upper Band", "boll_lb": "Real Lower Band",
-            "rsi": "RSI", "atr": "ATR", "close_10_ema": "EMA",
-            "close_50_sma": "SMA", "close_200_sma": "SMA"
-        }
-
-        target_col_name = col_name_map.get(indicator)
-
-        if not target_col_name:
-            # Default to the second column if no specific mapping exists
-            value_col_idx = 1
-        else:
-            try:
-                value_col_idx = header.index(target_col_name)
-            except ValueError:
-                return f"Error: Column '{target_col_name}' not found for indicator '{indicator}'. Available columns: {header}"
+            raise ValueError(f"'time' column not found in data for {indicator}. Available columns: {header}")
+
+        try:
+            value_col_idx = header.index(target_col_name)
+        except ValueError:
+            raise ValueError(f"Column '{target_col_name}' not found for indicator '{indicator}'. Available columns: {header}")
 
         result_data = []
-        for line in lines[1:]:
-            if not line.strip():
-                continue
-            values = line.split(',')
+        for values in rows:
             if len(values) > value_col_idx:
                 try:
                     date_str = values[date_col_idx].strip()
@@ -218,5 +173,36 @@ def get_indicator(
         return result_str
 
     except Exception as e:
-        print(f"Error getting Alpha Vantage indicator data for {indicator}: {e}")
-        return f"Error retrieving {indicator} data: {str(e)}"
+        # Raised rather than returned so the router counts the failure and falls back
+        logger.warning("Error getting Alpha Vantage indicator data for %s: %s", indicator, e)
+        raise
+
+
+def get_indicators_table(
+    symbol: str,
+    indicators: list[str],
+    curr_date: str,
+    look_back_days: int,
+) -> str:
+    """
+    Returns Alpha Vantage values for several technical indicators over a time window.
+
+    Args:
+        symbol: ticker symbol of the company
+        indicators: technical indicators to get the analysis and report of
+        curr_date: The current trading date you are trading on, YYYY-mm-dd
+        look_back_days: how many days to look back
+
+    Returns:
+        String containing the values and description of each indicator
+    """
+    if isinstance(indicators, str):
+        indicators = [i.strip() for i in indicators.split(",") if i.strip()]
+
+    # Indicators are fetched concurrently on the bounded Alpha Vantage pool
+    return "\n\n".join(
+        map_parallel(
+            lambda indicator: get_indicator(symbol, indicator, curr_date, look_back_days),
+            dict.fromkeys(indicators),
+        )
+    )
@@ -0,0 +1,233 @@
+import os
+import json
+import hashlib
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date
+from typing import Annotated, List, Optional
+
+from .alpha_vantage_common import _make_api_request
+from .config import get_config
+
+# Series whose latest 100 rows can be requested with outputsize=compact
+INCREMENTAL_FUNCTIONS = {"TIME_SERIES_DAILY", "TIME_SERIES_DAILY_ADJUSTED"}
+
+# Series used most recently, at most alpha_vantage_series_cache_size of them;
+# evicted series are read back from data_cache_dir when needed again
+_series: "OrderedDict[str, CachedSeries]" = OrderedDict()
+_series_lock = threading.Lock()
+
+
+def _is_csv_series(text: str) -> bool:
+    """Whether a response is a CSV series rather than an error or info message."""
+    header = text.lstrip().split("\n", 1)[0].strip().lower()
+    return header.startswith("timestamp,") or header.startswith("time,")
+
+
+def _split_rows(text: str):
+    lines = [line.rstrip("\r") for line in text.strip().split("\n") if line.strip()]
+    return lines[0], lines[1:]
+
+
+def _row_date(row: str) -> str:
+    return row.split(",", 1)[0].strip()[:10]
+
+
+class CachedSeries:
+    """
+    Full history of one Alpha Vantage daily series, kept as the CSV text the
+    API returns (newest row first) in memory and under
+    ``data_cache_dir/alpha_vantage_series``, with the dates and offsets of its
+    rows so date ranges are sliced out by bisection.
+
+    The full history is fetched once. A request ending after the newest
+    cached day refreshes the series at most once a day: time series fetch
+    only their latest 100 rows (``outputsize=compact``) and prepend the new
+    days, other series are fetched again in full.
+    """
+
+    def __init__(self, function_name: str, params: dict, cache_path: str):
+        self.function_name = function_name
+        self.params = params
+        self.cache_path = cache_path
+        self.text: Optional[str] = None
+        self.checked_on: Optional[str] = None
+        self._dates: List[str] = []  # oldest first
+        self._offsets: List[int] = []  # start of each row in text, newest first, then its end
+        self._lock = threading.Lock()
+        self._load()
+
+    def _meta_path(self) -> str:
+        return self.cache_path + ".json"
+
+    def _load(self):
+        try:
+            with open(self._meta_path(), "r") as f:
+                meta = json.load(f)
+            with open(self.cache_path, "r") as f:
+                self._set_text(f.read())
+            self.checked_on = meta["checked_on"]
+        except (OSError, ValueError, KeyError):
+            self._set_text(None)
+            self.checked_on = None
+
+    def _set_text(self, text: Optional[str]):
+        """Store the series with one row per line and index its rows."""
+        self._dates, self._offsets = [], []
+        if text is None:
+            self.text = None
+            return
+
+        header, rows = _split_rows(text)
+        self.text = "\n".join([header] + rows) + "\n"
+        position = len(header) + 1
+        for row in rows:
+            self._offsets.append(position)
+            position += len(row) + 1
+        self._offsets.append(position)
+        self._dates = [_row_date(row) for row in reversed(rows)]
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        for path, content in (
+            (self.cache_path, self.text),
+            (self._meta_path(), json.dumps({"checked_on": self.checked_on})),
+        ):
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+    def newest_date(self) -> Optional[str]:
+        return self._dates[-1] if self._dates else None
+
+    def _slice(self, start_date: str, end_date: str) -> str:
+        """The header and the rows dated within [start_date, end_date] (inclusive)."""
+        count = len(self._dates)
+        first = count - bisect_right(self._dates, end_date)
+        last = count - bisect_left(self._dates, start_date)
+        header_end = self._offsets[0] if self._offsets else len(self.text)
+        if first >= last:
+            return self.text[:header_end]
+        return self.text[:header_end] + self.text[self._offsets[first] : self._offsets[last]]
+
+    def _fetch(self, outputsize: str) -> str:
+        params = dict(self.params)
+        if self.function_name in INCREMENTAL_FUNCTIONS:
+            params["outputsize"] = outputsize
+        return _make_api_request(self.function_name, params)
+
+    def _merge_compact(self, compact: str) -> Optional[str]:
+        """
+        Prepend the days of a compact response newer than the cached history.
+        Returns None when a full fetch is needed instead: the compact rows do
+        not reach back to the cache, or the days they share differ (e.g.
+        adjusted prices after a split or dividend).
+        """
+        header, cached_rows = _split_rows(self.text)
+        compact_header, compact_rows = _split_rows(compact)
+        if compact_header != header or not compact_rows:
+            return None
+
+        cached_by_date = {_row_date(row): row for row in cached_rows[: len(compact_rows)]}
+        newest = _row_date(cached_rows[0])
+
+        new_rows = [row for row in compact_rows if _row_date(row) > newest]
+        if len(new_rows) == len(compact_rows):
+            return None
+        for row in compact_rows[len(new_rows):]:
+            cached = cached_by_date.get(_row_date(row))
+            if cached is not None and cached != row:
+                return None
+
+        return "\n".join([header] + new_rows + cached_rows) + "\n"
+
+    def get(self, end_date: Annotated[str, "Last date needed, yyyy-mm-dd"]) -> str:
+        """Return the full series CSV, covering end_date when the API has it."""
+        with self._lock:
+            return self._refresh(end_date)
+
+    def get_range(
+        self,
+        start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+        end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+    ) -> str:
+        """Return the header and the rows dated within [start_date, end_date] (inclusive)."""
+        with self._lock:
+            response = self._refresh(end_date)
+            if response is not self.text:
+                return response
+            return self._slice(start_date, end_date)
+
+    def _refresh(self, end_date: str) -> str:
+        today = date.today().isoformat()
+        newest = self.newest_date()
+
+        if newest is not None and (end_date <= newest or self.checked_on == today):
+            return self.text
+
+        response = None
+        if newest is not None and self.function_name in INCREMENTAL_FUNCTIONS:
+            compact = self._fetch("compact")
+            if _is_csv_series(compact):
+                response = self._merge_compact(compact)
+            else:
+                return compact
+        if response is None:
+            response = self._fetch("full")
+            if not _is_csv_series(response):
+                # Error and rate limit messages are passed through uncached
+                return response
+
+        self._set_text(response)
+        self.checked_on = today
+        self._save()
+        return self.text
+
+
+def _get_cached_series(function_name: str, params: dict) -> CachedSeries:
+    key = json.dumps([function_name, sorted(params.items())])
+
+    with _series_lock:
+        series = _series.get(key)
+        if series is None:
+            digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+            cache_path = os.path.join(
+                get_config()["data_cache_dir"],
+                "alpha_vantage_series",
+                function_name,
+                f"{params.get('symbol', 'series')}-{digest}.csv",
+            )
+            series = CachedSeries(function_name, dict(params), cache_path)
+            _series[key] = series
+        _series.move_to_end(key)
+        while len(_series) > max(1, get_config().get("alpha_vantage_series_cache_size", 32)):
+            _series.popitem(last=False)
+
+    return series
+
+
+def get_series(
+    function_name: Annotated[str, "Alpha Vantage function, e.g. TIME_SERIES_DAILY_ADJUSTED or RSI"],
+    params: Annotated[dict, "Query parameters other than outputsize"],
+    end_date: Annotated[str, "Last date needed, yyyy-mm-dd"],
+) -> str:
+    """
+    Get the full history CSV of a daily Alpha Vantage series for params,
+    fetching or refreshing it only when end_date is not cached yet.
+    """
+    return _get_cached_series(function_name, params).get(end_date)
+
+
+def get_series_range(
+    function_name: Annotated[str, "Alpha Vantage function, e.g. TIME_SERIES_DAILY_ADJUSTED or RSI"],
+    params: Annotated[dict, "Query parameters other than outputsize"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+) -> str:
+    """
+    Like get_series, but only the header and the rows dated within
+    [start_date, end_date] (inclusive).
+    """
+    return _get_cached_series(function_name, params).get_range(start_date, end_date)
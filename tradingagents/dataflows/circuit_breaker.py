@@ -0,0 +1,141 @@
+import time
+import threading
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Dict, Optional, Tuple
+
+import openai
+import requests
+from curl_cffi.requests import exceptions as curl_exceptions
+from yfinance.exceptions import YFRateLimitError
+
+from .alpha_vantage_common import AlphaVantageRateLimitError
+from .config import get_config
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Errors of a vendor that is rate limited, unreachable or too slow
+_VENDOR_FAILURES = (
+    AlphaVantageRateLimitError,
+    YFRateLimitError,
+    openai.RateLimitError,
+    openai.APIConnectionError,  # Includes openai.APITimeoutError
+    openai.InternalServerError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    curl_exceptions.ConnectionError,  # yfinance's HTTP client
+    curl_exceptions.Timeout,
+    ConnectionError,
+    TimeoutError,
+    FuturesTimeoutError,
+)
+_HTTP_ERRORS = (requests.exceptions.HTTPError, curl_exceptions.HTTPError)
+
+_breakers: Dict[Tuple[str, str], "CircuitBreaker"] = {}
+_breakers_lock = threading.Lock()
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for one vendor of one tool method.
+
+    After ``failure_threshold`` consecutive vendor failures (see
+    ``is_vendor_failure``) the circuit opens and the vendor is skipped for
+    ``cooldown`` seconds. The first call after the cooldown is let through
+    as a probe (half-open): success closes the circuit, failure opens it for
+    another cooldown. Should the probe never report back (e.g. it was served
+    from the cache or failed on its arguments), another one is allowed after
+    a further cooldown.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.changed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go to the vendor now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if now - self.changed_at < self.cooldown:
+                return False
+            # Let one probe through; later callers wait for its outcome
+            self.state = HALF_OPEN
+            self.changed_at = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            if self.state != CLOSED:
+                self.state = CLOSED
+                self.changed_at = time.monotonic()
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.state = OPEN
+                self.changed_at = time.monotonic()
+
+    def remaining_cooldown(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+        with self._lock:
+            if self.state == CLOSED:
+                return 0.0
+            return max(0.0, self.cooldown - (time.monotonic() - self.changed_at))
+
+
+def is_vendor_failure(error: BaseException) -> bool:
+    """
+    Whether an error of a vendor call speaks against the vendor: a rate
+    limit, a connection error, a timeout or an HTTP error other than a
+    client error. Errors in the call itself, such as an unsupported
+    indicator or a ticker without data, do not count toward its circuit.
+    """
+    if isinstance(error, _VENDOR_FAILURES):
+        return True
+    if isinstance(error, _HTTP_ERRORS):
+        status = getattr(error.response, "status_code", None)
+        return status is None or status == 429 or status >= 500
+    return False
+
+
+def get_circuit_breaker(method: str, vendor: str) -> Optional[CircuitBreaker]:
+    """
+    Get the process-wide circuit breaker for a vendor of a tool method, or
+    None when circuit breakers are disabled in the config. Thresholds and
+    cooldowns follow the current config.
+    """
+    config = get_config()
+    if not config.get("vendor_circuit_breaker", True):
+        return None
+
+    failure_threshold = config.get("vendor_breaker_failure_threshold", 5)
+    cooldown = config.get("vendor_breaker_cooldowns", {}).get(
+        vendor, config.get("vendor_breaker_cooldown", 60)
+    )
+
+    with _breakers_lock:
+        breaker = _breakers.get((method, vendor))
+        if breaker is None:
+            breaker = CircuitBreaker(failure_threshold, cooldown)
+            _breakers[(method, vendor)] = breaker
+        else:
+            breaker.failure_threshold = failure_threshold
+            breaker.cooldown = cooldown
+        return breaker
+
+
+def reset_circuit_breakers():
+    """Close every circuit, e.g. after the API quota was renewed."""
+    with _breakers_lock:
+        _breakers.clear()
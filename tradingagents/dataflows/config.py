@@ -1,9 +1,10 @@
 import tradingagents.default_config as default_config
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 
 # Use default config but allow it to be overridden
 _config: Optional[Dict] = None
 DATA_DIR: Optional[str] = None
+_change_callbacks: List[Callable[[], None]] = []
 
 
 def initialize_config():
@@ -21,6 +22,13 @@ def set_config(config: Dict):
         _config = default_config.DEFAULT_CONFIG.copy()
     _config.update(config)
     DATA_DIR = _config["data_dir"]
+    for callback in _change_callbacks:
+        callback()
+
+
+def on_config_change(callback: Callable[[], None]):
+    """Call callback after every set_config, e.g. to drop state derived from the config."""
+    _change_callbacks.append(callback)
 
 
 def get_config() -> Dict:
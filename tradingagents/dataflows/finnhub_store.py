@@ -0,0 +1,160 @@
+import os
+import json
+import threading
+from typing import Annotated, Dict
+
+import numpy as np
+
+from .config import get_config
+from .utils import get_source_fingerprint, write_atomically
+
+# Bump when the on-disk layout changes so stale stores are rebuilt
+STORE_VERSION = 1
+
+_stores: Dict[str, "FinnhubStore"] = {}
+_stores_lock = threading.Lock()
+
+
+class FinnhubStore:
+    """
+    Date-indexed copy of a Finnhub ``*_data_formatted.json`` file.
+
+    The JSON object is parsed once and rewritten as one JSON line per
+    non-empty date, sorted by date, next to the sorted date keys and the byte
+    offset of every line. A range lookup is two binary searches over the keys
+    and a single read of the matching lines, so only the requested days are
+    decoded.
+    """
+
+    def __init__(self, source_path: str, store_dir: str):
+        self.source_path = source_path
+        self.store_dir = store_dir
+        self.fingerprint = get_source_fingerprint(source_path)
+
+        if not self._is_current():
+            self._ingest()
+        self._load()
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.store_dir, "meta.json")
+
+    def _records_path(self) -> str:
+        return os.path.join(self.store_dir, "records.jsonl")
+
+    def _is_current(self) -> bool:
+        try:
+            with open(self._meta_path(), "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return (
+            meta.get("version") == STORE_VERSION
+            and meta.get("source") == self.fingerprint
+        )
+
+    def _ingest(self):
+        """Parse the source JSON once and persist one line per date."""
+        with open(self.source_path, "r") as f:
+            data = json.load(f)
+
+        # Days without entries never show up in a lookup
+        items = [(key, value) for key, value in data.items() if len(value) > 0]
+        order = sorted(range(len(items)), key=lambda i: items[i][0])
+
+        # Every file is replaced whole so concurrent readers never see a
+        # partial one; the meta file goes last
+        os.makedirs(self.store_dir, exist_ok=True)
+        offsets = [0]
+
+        def write_records(f):
+            for i in order:
+                line = (json.dumps(items[i][1]) + "\n").encode("utf-8")
+                f.write(line)
+                offsets.append(offsets[-1] + len(line))
+
+        write_atomically(self._records_path(), write_records)
+
+        self._save(
+            os.path.join(self.store_dir, "_date_key.npy"),
+            np.array([items[i][0] for i in order], dtype=str),
+        )
+        self._save(
+            os.path.join(self.store_dir, "_offset.npy"),
+            np.array(offsets, dtype=np.int64),
+        )
+        # Position of each date in the source file, to return days in file order
+        self._save(
+            os.path.join(self.store_dir, "_pos.npy"), np.array(order, dtype=np.int64)
+        )
+
+        # Metadata is written last so a partial ingest is never treated as current
+        meta = {"version": STORE_VERSION, "source": self.fingerprint}
+        write_atomically(self._meta_path(), lambda f: json.dump(meta, f), mode="w")
+
+    @staticmethod
+    def _save(path: str, values: np.ndarray):
+        write_atomically(path, lambda f: np.save(f, values))
+
+    def _load(self):
+        self.date_keys = np.load(os.path.join(self.store_dir, "_date_key.npy"))
+        self.offsets = np.load(os.path.join(self.store_dir, "_offset.npy"))
+        self.positions = np.load(os.path.join(self.store_dir, "_pos.npy"))
+
+    def is_stale(self) -> bool:
+        """Whether the source JSON changed since this store was built."""
+        try:
+            return get_source_fingerprint(self.source_path) != self.fingerprint
+        except OSError:
+            return True
+
+    def get_range(
+        self,
+        start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+        end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+    ) -> dict:
+        """
+        Return {date: entries} for the non-empty days within
+        [start_date, end_date] (inclusive), in the order of the source file.
+        """
+        lo = int(np.searchsorted(self.date_keys, start_date, "left"))
+        hi = int(np.searchsorted(self.date_keys, end_date, "right"))
+        if lo >= hi:
+            return {}
+
+        with open(self._records_path(), "rb") as f:
+            f.seek(int(self.offsets[lo]))
+            lines = f.read(int(self.offsets[hi] - self.offsets[lo])).splitlines()
+
+        days = sorted(
+            zip(self.positions[lo:hi], self.date_keys[lo:hi], lines),
+            key=lambda day: day[0],
+        )
+        return {str(key): json.loads(line) for _, key, line in days}
+
+
+def get_finnhub_store(
+    source_path: Annotated[str, "Path to a Finnhub *_data_formatted.json file"],
+) -> FinnhubStore:
+    """
+    Get the date-indexed store for a Finnhub data file, building it on first
+    use. Stores are shared across calls in the process and rebuilt when the
+    source file changes.
+    """
+    source_path = os.path.abspath(source_path)
+
+    with _stores_lock:
+        store = _stores.get(source_path)
+        if store is not None and not store.is_stale():
+            return store
+
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(f"Finnhub data file not found: {source_path}")
+
+        data_type = os.path.basename(os.path.dirname(source_path))
+        store_name = os.path.splitext(os.path.basename(source_path))[0]
+        store_dir = os.path.join(
+            get_config()["data_cache_dir"], "finnhub_store", data_type, store_name
+        )
+        store = FinnhubStore(source_path, store_dir)
+        _stores[source_path] = store
+        return store
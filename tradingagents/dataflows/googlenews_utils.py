@@ -1,4 +1,5 @@
 import json
+import logging
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
@@ -12,6 +13,8 @@ from tenacity import (
     retry_if_result,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def is_rate_limited(response):
     """Check if the response indicates rate limiting (status code 429)"""
@@ -88,7 +91,7 @@ def getNewsData(query, start_date, end_date):
                         }
                     )
                 except Exception as e:
-                    print(f"Error processing result: {e}")
+                    logger.debug("Error processing result: %s", e)
                     # If one of the fields is not found, skip this result
                     continue
 
@@ -102,7 +105,7 @@ def getNewsData(query, start_date, end_date):
             page += 1
 
         except Exception as e:
-            print(f"Failed after multiple retries: {e}")
+            logger.warning("Failed after multiple retries: %s", e)
             break
 
     return news_results
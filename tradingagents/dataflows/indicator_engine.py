@@ -0,0 +1,257 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Annotated, Callable, Dict, Hashable, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+# Default windows, matching stockstats so values are interchangeable
+RSI_WINDOW = 14
+ATR_WINDOW = 14
+VWMA_WINDOW = 14
+MFI_WINDOW = 14
+BOLL_WINDOW = 20
+BOLL_STD_TIMES = 2
+MACD_WINDOWS = (12, 26, 9)  # short, long, signal
+
+SUPPORTED_INDICATORS = (
+    "close_50_sma",
+    "close_200_sma",
+    "close_10_ema",
+    "macd",
+    "macds",
+    "macdh",
+    "rsi",
+    "boll",
+    "boll_ub",
+    "boll_lb",
+    "atr",
+    "vwma",
+    "mfi",
+)
+
+_MOVING_AVERAGE = re.compile(r"^close_(\d+)_(sma|ema)$")
+
+# Maximum number of price histories whose indicators are kept in memory
+MAX_CACHED_ENGINES = 32
+
+_engines: "OrderedDict[Hashable, IndicatorEngine]" = OrderedDict()
+_engines_lock = threading.Lock()
+
+
+def _sma(values: np.ndarray, window: int) -> np.ndarray:
+    return pd.Series(values).rolling(window, min_periods=1).mean().to_numpy()
+
+
+def _mov_sum(values: np.ndarray, window: int) -> np.ndarray:
+    return pd.Series(values).rolling(window, min_periods=1).sum().to_numpy()
+
+
+def _mov_std(values: np.ndarray, window: int) -> np.ndarray:
+    return pd.Series(values).rolling(window, min_periods=1).std().to_numpy()
+
+
+def _ema(values: np.ndarray, window: int) -> np.ndarray:
+    return (
+        pd.Series(values)
+        .ewm(ignore_na=False, span=window, min_periods=1, adjust=True)
+        .mean()
+        .to_numpy()
+    )
+
+
+def _smma(values: np.ndarray, window: int) -> np.ndarray:
+    return (
+        pd.Series(values)
+        .ewm(ignore_na=False, alpha=1.0 / window, min_periods=0, adjust=True)
+        .mean()
+        .to_numpy()
+    )
+
+
+def _diff(values: np.ndarray) -> np.ndarray:
+    out = np.zeros_like(values)
+    out[1:] = np.diff(values)
+    return out
+
+
+def _partial_window_sum(values: np.ndarray, window: int) -> np.ndarray:
+    cumsum = np.cumsum(values)
+    out = np.empty_like(cumsum)
+    out[window:] = cumsum[window:] - cumsum[:-window]
+    out[:window] = cumsum[:window]
+    return out
+
+
+class IndicatorEngine:
+    """
+    Vectorized technical indicators over one OHLCV price history.
+
+    Indicators are computed lazily on whole price arrays and memoized, so a
+    batch of indicators shares intermediate series (typical price, true
+    range, MACD lines) and repeated requests are a dictionary lookup.
+    Formulas follow stockstats so the values match the previous
+    stockstats-based implementation.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        columns = {str(c).lower(): c for c in data.columns}
+        dates = pd.to_datetime(data[columns["date"]].astype(str).str[:10])
+        order = np.argsort(dates.to_numpy(), kind="stable")
+
+        self.dates = dates.dt.strftime("%Y-%m-%d").to_numpy()[order]
+
+        def column(name):
+            return data[columns[name]].to_numpy(dtype=np.float64)[order]
+
+        self.high = column("high")
+        self.low = column("low")
+        self.close = column("close")
+        self.volume = column("volume")
+
+        self._values: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def _typical_price(self) -> np.ndarray:
+        if "_tp" not in self._values:
+            self._values["_tp"] = (self.close + self.high + self.low) / 3.0
+        return self._values["_tp"]
+
+    def _compute_macd(self):
+        short_w, long_w, signal_w = MACD_WINDOWS
+        macd = _ema(self.close, short_w) - _ema(self.close, long_w)
+        macds = _ema(macd, signal_w)
+        self._values["macd"] = macd
+        self._values["macds"] = macds
+        self._values["macdh"] = macd - macds
+
+    def _compute_rsi(self):
+        diff = _diff(self.close)
+        up = _smma(np.where(diff > 0, diff, 0.0), RSI_WINDOW)
+        down = _smma(np.where(diff < 0, -diff, 0.0), RSI_WINDOW)
+        total = up + down
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = np.where(total != 0, 100 * (up / total), 50.0)
+        rsi[0] = 50.0
+        self._values["rsi"] = rsi
+
+    def _compute_boll(self):
+        moving_avg = _sma(self.close, BOLL_WINDOW)
+        width = BOLL_STD_TIMES * _mov_std(self.close, BOLL_WINDOW)
+        self._values["boll"] = moving_avg
+        self._values["boll_ub"] = moving_avg + width
+        self._values["boll_lb"] = moving_avg - width
+
+    def _compute_atr(self):
+        prev_close = np.empty_like(self.close)
+        prev_close[:1] = self.close[:1]
+        prev_close[1:] = self.close[:-1]
+        tr = np.maximum(
+            self.high - self.low,
+            np.maximum(np.abs(self.high - prev_close), np.abs(self.low - prev_close)),
+        )
+        np.nan_to_num(tr, copy=False)
+        self._values["atr"] = _smma(tr, ATR_WINDOW)
+
+    def _compute_vwma(self):
+        rolling_tpv = _mov_sum(self.volume * self._typical_price(), VWMA_WINDOW)
+        rolling_vol = _mov_sum(self.volume, VWMA_WINDOW)
+        self._values["vwma"] = np.divide(
+            rolling_tpv,
+            rolling_vol,
+            out=np.zeros_like(rolling_tpv),
+            where=rolling_vol != 0,
+        )
+
+    def _compute_mfi(self):
+        tp = self._typical_price()
+        raw_money_flow = tp * self.volume
+        tp_diff = _diff(tp)
+        pos_sum = _partial_window_sum(np.where(tp_diff > 0, raw_money_flow, 0.0), MFI_WINDOW)
+        neg_sum = _partial_window_sum(np.where(tp_diff < 0, raw_money_flow, 0.0), MFI_WINDOW)
+        total = pos_sum + neg_sum
+        mfi = np.divide(pos_sum, total, out=np.full_like(pos_sum, 0.5), where=total > 0)
+        mfi[:MFI_WINDOW] = 0.5
+        self._values["mfi"] = mfi
+
+    def _compute(self, indicator: str):
+        match = _MOVING_AVERAGE.match(indicator)
+        if match:
+            window, kind = int(match.group(1)), match.group(2)
+            average = _sma if kind == "sma" else _ema
+            self._values[indicator] = average(self.close, window)
+        elif indicator in ("macd", "macds", "macdh"):
+            self._compute_macd()
+        elif indicator == "rsi":
+            self._compute_rsi()
+        elif indicator in ("boll", "boll_ub", "boll_lb"):
+            self._compute_boll()
+        elif indicator == "atr":
+            self._compute_atr()
+        elif indicator == "vwma":
+            self._compute_vwma()
+        elif indicator == "mfi":
+            self._compute_mfi()
+        else:
+            raise ValueError(
+                f"Indicator {indicator} is not supported. Please choose from: {list(SUPPORTED_INDICATORS)}"
+            )
+
+    def get(self, indicator: str) -> np.ndarray:
+        """Return the full-history values of one indicator."""
+        with self._lock:
+            if indicator not in self._values:
+                self._compute(indicator)
+            return self._values[indicator]
+
+    def compute(self, indicators: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Return the full-history values of several indicators."""
+        return {indicator: self.get(indicator) for indicator in indicators}
+
+    def values_on(
+        self,
+        indicator: str,
+        dates: Annotated[List[str], "Dates in yyyy-mm-dd format"],
+    ) -> List[str]:
+        """
+        Format the indicator value on each date. Dates without a trading row
+        map to None and missing values to "N/A".
+        """
+        values = self.get(indicator)
+        positions = np.searchsorted(self.dates, dates)
+        positions = np.minimum(positions, len(self.dates) - 1)
+
+        result = []
+        for date_str, pos in zip(dates, positions):
+            if len(self.dates) == 0 or self.dates[pos] != date_str:
+                result.append(None)
+            elif np.isnan(values[pos]):
+                result.append("N/A")
+            else:
+                result.append(str(float(values[pos])))
+        return result
+
+
+def get_indicator_engine(
+    key: Annotated[Hashable, "Identifies the price history, e.g. its data file"],
+    loader: Annotated[Callable[[], pd.DataFrame], "Loads the OHLCV frame on a miss"],
+) -> IndicatorEngine:
+    """
+    Get the shared engine for a price history, loading it on first use.
+    The most recently used MAX_CACHED_ENGINES histories are kept.
+    """
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is not None:
+            _engines.move_to_end(key)
+            return engine
+
+    engine = IndicatorEngine(loader())
+
+    with _engines_lock:
+        _engines[key] = engine
+        _engines.move_to_end(key)
+        while len(_engines) > MAX_CACHED_ENGINES:
+            _engines.popitem(last=False)
+    return engine
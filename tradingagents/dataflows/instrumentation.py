@@ -0,0 +1,200 @@
+import os
+import json
+import atexit
+import bisect
+import threading
+from typing import Dict, Optional, Tuple
+
+from .config import get_config, on_config_change
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# Upper bounds of the returned-bytes histogram buckets
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+_metrics: Optional["Metrics"] = None
+_metrics_lock = threading.Lock()
+_exit_hooks = set()
+# What get_metrics returns under the current config, once resolved; set_config
+# clears it so the next call reads the config again
+_active: Optional["Metrics"] = None
+_resolved = False
+
+
+def _labels_key(labels: dict) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Tuple = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Metrics:
+    """
+    Thread-safe counters and histograms for the data layer, keyed by metric
+    name and labels (e.g. method and vendor).
+
+    Snapshots can be written as JSON or in the Prometheus text exposition
+    format, so a node exporter textfile collector can pick them up.
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[tuple, float]] = {}
+        self._histograms: Dict[str, Dict[tuple, list]] = {}
+        self._buckets: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add value to the counter name for labels."""
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: tuple = LATENCY_BUCKETS, **labels):
+        """Record value in the histogram name for labels."""
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            self._buckets.setdefault(name, buckets)
+            bounds = self._buckets[name]
+            entry = series.get(key)
+            if entry is None:
+                # Per-bucket counts (last one is +Inf), then count and sum
+                entry = [[0] * (len(bounds) + 1), 0, 0.0]
+                series[key] = entry
+            entry[0][bisect.bisect_left(bounds, value)] += 1
+            entry[1] += 1
+            entry[2] += value
+
+    def snapshot(self) -> dict:
+        """All counters and histograms as plain data."""
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {}
+            for name, series in self._histograms.items():
+                bounds = self._buckets[name]
+                histograms[name] = [
+                    {
+                        "labels": dict(key),
+                        "buckets": dict(zip([str(b) for b in bounds] + ["+Inf"], counts)),
+                        "count": count,
+                        "sum": total,
+                    }
+                    for key, (counts, count, total) in series.items()
+                ]
+        return {"counters": counters, "histograms": histograms}
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+
+            for name, series in sorted(self._histograms.items()):
+                bounds = self._buckets[name]
+                lines.append(f"# TYPE {name} histogram")
+                for key, (counts, count, total) in series.items():
+                    cumulative = 0
+                    for bound, bucket_count in zip(list(bounds) + ["+Inf"], counts):
+                        cumulative += bucket_count
+                        le = (("le", str(bound)),)
+                        lines.append(f"{name}_bucket{_format_labels(key, le)} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {total}")
+                    lines.append(f"{name}_count{_format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """
+        Write a snapshot to path, in the Prometheus text format when it ends
+        with ``.prom`` and as JSON otherwise.
+        """
+        if path.endswith(".prom"):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.snapshot(), indent=2)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._buckets.clear()
+
+
+def get_metrics() -> Optional[Metrics]:
+    """
+    Get the process-wide metrics registry, or None when metrics are disabled
+    in the config, so callers skip all bookkeeping. When metrics_file is set
+    the metrics are also written there at exit. The config is only read
+    again after set_config.
+    """
+    global _metrics, _active, _resolved
+
+    if _resolved:
+        return _active
+
+    with _metrics_lock:
+        config = get_config()
+        if not config.get("metrics_enabled", False):
+            _active = None
+        else:
+            if _metrics is None:
+                _metrics = Metrics()
+            metrics_file = config.get("metrics_file")
+            if metrics_file and metrics_file not in _exit_hooks:
+                _exit_hooks.add(metrics_file)
+                atexit.register(_write_at_exit, metrics_file)
+            _active = _metrics
+        _resolved = True
+        return _active
+
+
+def _config_changed():
+    global _resolved
+    with _metrics_lock:
+        _resolved = False
+
+
+on_config_change(_config_changed)
+
+
+def _write_at_exit(path: str):
+    if _metrics is not None:
+        try:
+            _metrics.write(path)
+        except OSError:
+            pass
+
+
+def write_metrics(path: Optional[str] = None) -> Optional[str]:
+    """
+    Write the current metrics to path (default: metrics_file from the
+    config). Returns the path written, or None when there was nothing to
+    write.
+    """
+    path = path or get_config().get("metrics_file")
+    if _metrics is None or not path:
+        return None
+    _metrics.write(path)
+    return path
@@ -1,13 +1,25 @@
+import time
+import logging
+import functools
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError as FuturesTimeoutError,
+    wait,
+)
 from typing import Annotated
 
 # Import from vendor-specific modules
 from .local import get_YFin_data, get_finnhub_news, get_finnhub_company_insider_sentiment, get_finnhub_company_insider_transactions, get_simfin_balance_sheet, get_simfin_cashflow, get_simfin_income_statements, get_reddit_global_news, get_reddit_company_news
-from .y_finance import get_YFin_data_online, get_stock_stats_indicators_window, get_balance_sheet as get_yfinance_balance_sheet, get_cashflow as get_yfinance_cashflow, get_income_statement as get_yfinance_income_statement, get_insider_transactions as get_yfinance_insider_transactions
+from .y_finance import get_YFin_data_online, get_stock_stats_indicators_window, get_stock_stats_indicators_table, get_balance_sheet as get_yfinance_balance_sheet, get_cashflow as get_yfinance_cashflow, get_income_statement as get_yfinance_income_statement, get_insider_transactions as get_yfinance_insider_transactions
 from .google import get_google_news
 from .openai import get_stock_news_openai, get_global_news_openai, get_fundamentals_openai
 from .alpha_vantage import (
     get_stock as get_alpha_vantage_stock,
     get_indicator as get_alpha_vantage_indicator,
+    get_indicators_table as get_alpha_vantage_indicators_table,
     get_fundamentals as get_alpha_vantage_fundamentals,
     get_balance_sheet as get_alpha_vantage_balance_sheet,
     get_cashflow as get_alpha_vantage_cashflow,
@@ -16,10 +28,23 @@ from .alpha_vantage import (
     get_news as get_alpha_vantage_news
 )
 from .alpha_vantage_common import AlphaVantageRateLimitError
+from .vendor_cache import get_vendor_cache
+from .vendor_stats import get_vendor_stats
+from .circuit_breaker import get_circuit_breaker, is_vendor_failure
+from .instrumentation import SIZE_BUCKETS, get_metrics
 
 # Configuration and routing logic
 from .config import get_config
 
+logger = logging.getLogger(__name__)
+
+# Pools for concurrent vendor calls, one per vendor so calls still running past
+# vendor_timeout only hold their own vendor's workers. Created lazily and
+# rebuilt when their size changes.
+_fanout_lock = threading.Lock()
+_fanout_executors = {}
+_fanout_workers = None
+
 # Tools organized by category
 TOOLS_CATEGORIES = {
     "core_stock_apis": {
@@ -31,7 +56,8 @@ TOOLS_CATEGORIES = {
     "technical_indicators": {
         "description": "Technical analysis indicators",
         "tools": [
-            "get_indicators"
+            "get_indicators",
+            "get_indicators_batch"
         ]
     },
     "fundamental_data": {
@@ -75,6 +101,11 @@ VENDOR_METHODS = {
         "yfinance": get_stock_stats_indicators_window,
         "local": get_stock_stats_indicators_window
     },
+    "get_indicators_batch": {
+        "alpha_vantage": get_alpha_vantage_indicators_table,
+        "yfinance": get_stock_stats_indicators_table,
+        "local": get_stock_stats_indicators_table
+    },
     # fundamental_data
     "get_fundamentals": {
         "alpha_vantage": get_alpha_vantage_fundamentals,
@@ -138,6 +169,215 @@ def get_vendor(category: str, method: str = None) -> str:
     # Fall back to category-level configuration
     return config.get("data_vendors", {}).get(category, "default")
 
+def _get_fanout_executor(vendor: str) -> ThreadPoolExecutor:
+    """Get the pool that runs a vendor's calls in fan-out mode."""
+    global _fanout_workers
+
+    workers = get_config().get("vendor_fanout_workers", 8)
+    with _fanout_lock:
+        if _fanout_workers != workers:
+            for executor in _fanout_executors.values():
+                executor.shutdown(wait=False)
+            _fanout_executors.clear()
+            _fanout_workers = workers
+        executor = _fanout_executors.get(vendor)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=f"vendor_fanout_{vendor}"
+            )
+            _fanout_executors[vendor] = executor
+        return executor
+
+
+def _call_vendor(cache, method, vendor_name, impl_func, args, kwargs):
+    stats = get_vendor_stats()
+    breaker = get_circuit_breaker(method, vendor_name)
+    metrics = get_metrics()
+
+    # Only real vendor calls are timed and counted, not cache hits
+    @functools.wraps(impl_func)
+    def timed_impl(*impl_args, **impl_kwargs):
+        start = time.monotonic()
+        try:
+            result = impl_func(*impl_args, **impl_kwargs)
+        except Exception as e:
+            elapsed = time.monotonic() - start
+            stats.record(method, vendor_name, elapsed, False)
+            if breaker is not None and is_vendor_failure(e):
+                breaker.record_failure()
+            if metrics is not None:
+                outcome = "rate_limited" if isinstance(e, AlphaVantageRateLimitError) else "error"
+                metrics.inc("tradingagents_vendor_calls_total", method=method, vendor=vendor_name, outcome=outcome)
+                metrics.observe("tradingagents_vendor_call_seconds", elapsed, method=method, vendor=vendor_name)
+            raise
+        elapsed = time.monotonic() - start
+        stats.record(method, vendor_name, elapsed, True)
+        if breaker is not None:
+            breaker.record_success()
+        if metrics is not None:
+            metrics.inc("tradingagents_vendor_calls_total", method=method, vendor=vendor_name, outcome="success")
+            metrics.observe("tradingagents_vendor_call_seconds", elapsed, method=method, vendor=vendor_name)
+            metrics.observe(
+                "tradingagents_vendor_result_bytes",
+                len(result.encode("utf-8")) if isinstance(result, str) else len(str(result)),
+                buckets=SIZE_BUCKETS,
+                method=method,
+                vendor=vendor_name,
+            )
+        return result
+
+    if cache is not None:
+        return cache.call(method, vendor_name, timed_impl, args, kwargs)
+    return timed_impl(*args, **kwargs)
+
+
+def _run_calls(calls, cache, method, args, kwargs):
+    """
+    Run (vendor, impl_func) calls and return their (result, error) outcomes
+    in the order of calls. With vendor_fanout enabled the calls run
+    concurrently on their vendors' pools and any call without a result after
+    vendor_timeout seconds counts as failed. Python threads cannot be
+    stopped, so the call runs on and its result is discarded.
+    """
+    config = get_config()
+
+    if not config.get("vendor_fanout", False) or len(calls) < 2:
+        outcomes = []
+        for vendor_name, impl_func in calls:
+            logger.debug("Calling %s from vendor '%s'", impl_func.__name__, vendor_name)
+            try:
+                outcomes.append((_call_vendor(cache, method, vendor_name, impl_func, args, kwargs), None))
+            except Exception as e:
+                outcomes.append((None, e))
+        return outcomes
+
+    timeout = config.get("vendor_timeout", 30)
+    futures = _submit_calls(calls, cache, method, args, kwargs)
+
+    deadline = time.monotonic() + timeout
+    outcomes = []
+    for (vendor_name, impl_func), future in zip(calls, futures):
+        try:
+            outcomes.append((future.result(timeout=max(0.0, deadline - time.monotonic())), None))
+        except FuturesTimeoutError:
+            outcomes.append((None, TimeoutError(f"no result within {timeout}s")))
+            metrics = get_metrics()
+            if metrics is not None:
+                metrics.inc("tradingagents_vendor_timeouts_total", method=method, vendor=vendor_name)
+        except Exception as e:
+            outcomes.append((None, e))
+    return outcomes
+
+
+def _submit_calls(calls, cache, method, args, kwargs) -> list:
+    """Submit (vendor, impl_func) calls to their vendors' pools, returning their futures."""
+    futures = []
+    for vendor_name, impl_func in calls:
+        logger.debug("Calling %s from vendor '%s' concurrently", impl_func.__name__, vendor_name)
+        futures.append(
+            _get_fanout_executor(vendor_name).submit(
+                _call_vendor, cache, method, vendor_name, impl_func, args, kwargs
+            )
+        )
+    return futures
+
+
+def _plan_calls(method, wave, primary_vendors, attempts_so_far):
+    """Expand the vendors of a wave into their (vendor, impl_func) calls."""
+    metrics = get_metrics()
+    calls = []
+    for attempt, vendor in enumerate(wave, attempts_so_far + 1):
+        vendor_impl = VENDOR_METHODS[method][vendor]
+
+        vendor_type = "primary" if vendor in primary_vendors else "fallback"
+        logger.debug("Attempting %s vendor '%s' for %s (attempt #%d)", vendor_type, vendor, method, attempt)
+        if metrics is not None:
+            metrics.inc("tradingagents_vendor_attempts_total", method=method, vendor=vendor, role=vendor_type)
+
+        # Handle list of methods for a vendor
+        if isinstance(vendor_impl, list):
+            logger.debug("Vendor '%s' has multiple implementations: %d functions", vendor, len(vendor_impl))
+            calls.extend((vendor, impl) for impl in vendor_impl)
+        else:
+            calls.append((vendor, vendor_impl))
+    return calls
+
+
+def _start_calls(calls, cache, method, args, kwargs) -> Future:
+    """
+    Submit calls to their vendors' pools without waiting for them. The future
+    resolves to their (result, error) outcomes once every call is done.
+    """
+    futures = _submit_calls(calls, cache, method, args, kwargs)
+    outcomes = Future()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def on_done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        outcomes.set_result(
+            [
+                (None, future.exception()) if future.exception() else (future.result(), None)
+                for future in futures
+            ]
+        )
+
+    for future in futures:
+        future.add_done_callback(on_done)
+    return outcomes
+
+
+def _allowed_vendors(method, wave, open_circuits) -> list:
+    """
+    The vendors of a wave whose circuit breaker lets a call through, checked
+    right before the wave is called since letting a half-open probe through
+    commits to making that call. Vendors skipped are added to open_circuits.
+    """
+    metrics = get_metrics()
+    allowed = []
+    for vendor in wave:
+        # Skip vendors that kept failing until their cooldown has passed
+        breaker = get_circuit_breaker(method, vendor)
+        if breaker is not None and not breaker.allow():
+            open_circuits.append(vendor)
+            logger.info("Circuit open, skipping vendor '%s' for %s for another %.0fs", vendor, method, breaker.remaining_cooldown())
+            if metrics is not None:
+                metrics.inc("tradingagents_vendor_circuit_open_total", method=method, vendor=vendor)
+            continue
+        allowed.append(vendor)
+    return allowed
+
+
+def _merge_outcomes(wave, calls, outcomes) -> list:
+    """Collect the results of a wave in the configured vendor and implementation order."""
+    results = []
+    for vendor in wave:
+        vendor_results = []
+        for (vendor_name, impl_func), (result, error) in zip(calls, outcomes):
+            if vendor_name != vendor:
+                continue
+            if error is None:
+                vendor_results.append(result)
+                logger.debug("%s from vendor '%s' completed successfully", impl_func.__name__, vendor_name)
+            elif isinstance(error, AlphaVantageRateLimitError):
+                if vendor == "alpha_vantage":
+                    logger.warning("Alpha Vantage rate limit exceeded, falling back to next available vendor: %s", error)
+            else:
+                # Log error but continue with other implementations
+                logger.warning("%s from vendor '%s' failed: %s", impl_func.__name__, vendor_name, error)
+
+        # Add this vendor's results
+        if vendor_results:
+            results.extend(vendor_results)
+            logger.debug("Vendor '%s' succeeded with %d result(s)", vendor, len(vendor_results))
+        else:
+            logger.info("Vendor '%s' produced no results", vendor)
+    return results
+
+
 def route_to_vendor(method: str, *args, **kwargs):
     """Route method calls to appropriate vendor implementation with fallback support."""
     category = get_category_for_method(method)
@@ -158,87 +398,146 @@ def route_to_vendor(method: str, *args, **kwargs):
         if vendor not in fallback_vendors:
             fallback_vendors.append(vendor)
 
-    # Debug: Print fallback ordering
-    primary_str = " → ".join(primary_vendors)
-    fallback_str = " → ".join(fallback_vendors)
-    print(f"DEBUG: {method} - Primary: [{primary_str}] | Full fallback order: [{fallback_str}]")
-
-    # Track results and execution state
-    results = []
-    vendor_attempt_count = 0
-    any_primary_vendor_attempted = False
-    successful_vendor = None
+    logger.debug(
+        "%s - primary: [%s] | full fallback order: [%s]",
+        method, " → ".join(primary_vendors), " → ".join(fallback_vendors),
+    )
+    metrics = get_metrics()
+    route_start = time.monotonic()
 
+    supported_vendors = []
     for vendor in fallback_vendors:
         if vendor not in VENDOR_METHODS[method]:
             if vendor in primary_vendors:
-                print(f"INFO: Vendor '{vendor}' not supported for method '{method}', falling back to next vendor")
+                logger.info("Vendor '%s' not supported for method '%s', falling back to next vendor", vendor, method)
             continue
+        supported_vendors.append(vendor)
 
-        vendor_impl = VENDOR_METHODS[method][vendor]
-        is_primary_vendor = vendor in primary_vendors
-        vendor_attempt_count += 1
+    # Latency-aware selection and hedging only apply when one vendor's result is wanted
+    config = get_config()
+    stats = get_vendor_stats()
+    hedge_percentile = None
+    if len(primary_vendors) == 1:
+        if config.get("vendor_selection", "ordered") == "fastest":
+            supported_vendors = stats.rank(method, supported_vendors)
+        hedge_percentile = config.get("vendor_hedge_percentile")
 
-        # Track if we attempted any primary vendor
-        if is_primary_vendor:
-            any_primary_vendor_attempted = True
+    # Vendors are tried in waves. A single-vendor config stops after the first
+    # vendor that returns results; multiple vendor configs (comma-separated)
+    # collect from every vendor, so they form a single wave.
+    if len(primary_vendors) == 1:
+        waves = [[vendor] for vendor in supported_vendors]
+    else:
+        waves = [supported_vendors]
 
-        # Debug: Print current attempt
-        vendor_type = "PRIMARY" if is_primary_vendor else "FALLBACK"
-        print(f"DEBUG: Attempting {vendor_type} vendor '{vendor}' for {method} (attempt #{vendor_attempt_count})")
+    # Shared result cache (None when disabled in the config)
+    cache = get_vendor_cache()
 
-        # Handle list of methods for a vendor
-        if isinstance(vendor_impl, list):
-            vendor_methods = [(impl, vendor) for impl in vendor_impl]
-            print(f"DEBUG: Vendor '{vendor}' has multiple implementations: {len(vendor_methods)} functions")
-        else:
-            vendor_methods = [(vendor_impl, vendor)]
+    # Track results and execution state
+    results = []
+    vendor_attempt_count = 0
+    open_circuits = []
 
-        # Run methods for this vendor
-        vendor_results = []
-        for impl_func, vendor_name in vendor_methods:
-            try:
-                print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor_name}'...")
-                result = impl_func(*args, **kwargs)
-                vendor_results.append(result)
-                print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor_name}' completed successfully")
-                    
-            except AlphaVantageRateLimitError as e:
-                if vendor == "alpha_vantage":
-                    print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
-                    print(f"DEBUG: Rate limit details: {e}")
-                # Continue to next vendor for fallback
-                continue
-            except Exception as e:
-                # Log error but continue with other implementations
-                print(f"FAILED: {impl_func.__name__} from vendor '{vendor_name}' failed: {e}")
-                continue
+    i = 0
+    while i < len(waves):
+        wave = _allowed_vendors(method, waves[i], open_circuits)
+        if not wave:
+            i += 1
+            continue
+        calls = _plan_calls(method, wave, primary_vendors, vendor_attempt_count)
+        vendor_attempt_count += len(wave)
 
-        # Add this vendor's results
-        if vendor_results:
-            results.extend(vendor_results)
-            successful_vendor = vendor
-            result_summary = f"Got {len(vendor_results)} result(s)"
-            print(f"SUCCESS: Vendor '{vendor}' succeeded - {result_summary}")
-            
-            # Stopping logic: Stop after first successful vendor for single-vendor configs
-            # Multiple vendor configs (comma-separated) may want to collect from multiple sources
-            if len(primary_vendors) == 1:
-                print(f"DEBUG: Stopping after successful vendor '{vendor}' (single-vendor config)")
-                break
+        # Hedge a single slow vendor with the next one once it exceeds its usual latency
+        hedge_delay = None
+        if hedge_percentile and len(wave) == 1 and i + 1 < len(waves):
+            hedge_delay = stats.latency_percentile(method, wave[0], hedge_percentile)
+
+        if hedge_delay is None:
+            outcomes = _run_calls(calls, cache, method, args, kwargs)
+            results.extend(_merge_outcomes(wave, calls, outcomes))
+            i += 1
         else:
-            print(f"FAILED: Vendor '{vendor}' produced no results")
+            timeout = config.get("vendor_timeout", 30)
+            deadline = time.monotonic() + timeout
+            primary = _start_calls(calls, cache, method, args, kwargs)
+            backup_wave = []
+            next_wave = i + 1
+            if not wait([primary], timeout=hedge_delay).done:
+                # The next vendor whose circuit lets a call through backs up the slow one
+                while not backup_wave and next_wave < len(waves):
+                    backup_wave = _allowed_vendors(method, waves[next_wave], open_circuits)
+                    next_wave += 1
+
+            if not backup_wave:
+                try:
+                    outcomes = primary.result(timeout=max(0.0, deadline - time.monotonic()))
+                except FuturesTimeoutError:
+                    logger.warning("Vendor '%s' returned no result for %s within %ss", wave[0], method, timeout)
+                    if metrics is not None:
+                        metrics.inc("tradingagents_vendor_timeouts_total", method=method, vendor=wave[0])
+                    outcomes = [(None, TimeoutError(f"no result within {timeout}s"))] * len(calls)
+                results.extend(_merge_outcomes(wave, calls, outcomes))
+                i = next_wave
+            else:
+                logger.info(
+                    "Vendor '%s' exceeded its p%s latency of %.2fs for %s, also trying '%s'",
+                    wave[0], hedge_percentile, hedge_delay, method, backup_wave[0],
+                )
+                if metrics is not None:
+                    metrics.inc("tradingagents_vendor_hedges_total", method=method, vendor=backup_wave[0])
+                backup_calls = _plan_calls(method, backup_wave, primary_vendors, vendor_attempt_count)
+                vendor_attempt_count += len(backup_wave)
+                backup = _start_calls(backup_calls, cache, method, args, kwargs)
+
+                # Take the first vendor to return results; the other keeps running in the background
+                deadline = time.monotonic() + timeout
+                pending = {primary: (wave, calls), backup: (backup_wave, backup_calls)}
+                while pending and not results:
+                    done, _ = wait(
+                        pending,
+                        timeout=max(0.0, deadline - time.monotonic()),
+                        return_when=FIRST_COMPLETED,
+                    )
+                    if not done:
+                        for pending_wave, _ in pending.values():
+                            logger.warning("Vendor '%s' returned no result for %s within %ss", pending_wave[0], method, timeout)
+                            if metrics is not None:
+                                metrics.inc("tradingagents_vendor_timeouts_total", method=method, vendor=pending_wave[0])
+                        break
+                    for future in (primary, backup):
+                        if future in done and future in pending and not results:
+                            done_wave, done_calls = pending.pop(future)
+                            results.extend(_merge_outcomes(done_wave, done_calls, future.result()))
+                            wave = done_wave
+                i = next_wave
+
+        # Stopping logic: Stop after first successful vendor for single-vendor configs
+        if results and len(primary_vendors) == 1:
+            logger.debug("Stopping after successful vendor '%s' (single-vendor config)", wave[0])
+            break
+
+    if metrics is not None:
+        metrics.inc("tradingagents_vendor_routes_total", method=method, outcome="success" if results else "failure")
+        metrics.observe("tradingagents_vendor_route_seconds", time.monotonic() - route_start, method=method)
 
     # Final result summary
     if not results:
-        print(f"FAILURE: All {vendor_attempt_count} vendor attempts failed for method '{method}'")
+        logger.error("All %d vendor attempts failed for method '%s'", vendor_attempt_count, method)
+        if open_circuits:
+            raise RuntimeError(
+                f"All vendor implementations failed for method '{method}' "
+                f"(circuit open for: {', '.join(open_circuits)})"
+            )
         raise RuntimeError(f"All vendor implementations failed for method '{method}'")
     else:
-        print(f"FINAL: Method '{method}' completed with {len(results)} result(s) from {vendor_attempt_count} vendor attempt(s)")
+        logger.debug(
+            "%s completed with %d result(s) from %d vendor attempt(s)",
+            method, len(results), vendor_attempt_count,
+        )
 
     # Return single result if only one, otherwise concatenate as string
     if len(results) == 1:
         return results[0]
     else:
         # Convert all results to strings and concatenate
-        return '\n'.join(str(result) for result in results)
\ No newline at end of file
+        return '\n'.join(str(result) for result in results)
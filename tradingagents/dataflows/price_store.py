@@ -0,0 +1,169 @@
+import os
+import json
+import threading
+from typing import Annotated, Dict
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .utils import get_source_fingerprint, write_atomically
+
+# Bump when the on-disk layout changes so stale stores are rebuilt
+STORE_VERSION = 1
+
+_stores: Dict[str, "PriceStore"] = {}
+_stores_lock = threading.Lock()
+
+
+class PriceStore:
+    """
+    Columnar, memory-mapped copy of a price CSV with a sorted date index.
+
+    The CSV is parsed once and every column is written as its own ``.npy``
+    file next to a ``datetime64[D]`` key array sorted ascending. Range queries
+    are two binary searches over the key array followed by a slice of the
+    memory-mapped columns, so no per-call parsing happens after the ingest.
+    """
+
+    def __init__(self, source_path: str, store_dir: str):
+        self.source_path = source_path
+        self.store_dir = store_dir
+        self.fingerprint = get_source_fingerprint(source_path)
+
+        if not self._is_current():
+            self._ingest()
+        self._load()
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.store_dir, "meta.json")
+
+    def _is_current(self) -> bool:
+        try:
+            with open(self._meta_path(), "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return (
+            meta.get("version") == STORE_VERSION
+            and meta.get("source") == self.fingerprint
+        )
+
+    def _ingest(self):
+        """Parse the source CSV once and persist it column by column."""
+        data = pd.read_csv(self.source_path)
+
+        keys = pd.to_datetime(data["Date"].astype(str).str[:10]).values.astype(
+            "datetime64[D]"
+        )
+        order = np.argsort(keys, kind="stable")
+
+        # Every file is replaced whole, as other processes or an older
+        # PriceStore may have the previous version memory-mapped
+        os.makedirs(self.store_dir, exist_ok=True)
+        self._save(os.path.join(self.store_dir, "_date_key.npy"), keys[order])
+        self._save(
+            os.path.join(self.store_dir, "_row.npy"),
+            data.index.to_numpy(dtype=np.int64)[order],
+        )
+
+        columns = []
+        for i, name in enumerate(data.columns):
+            values = data[name].to_numpy()
+            if values.dtype == object:
+                # Fixed-width unicode keeps the column memory-mappable
+                values = data[name].astype(str).to_numpy(dtype=str)
+            self._save(os.path.join(self.store_dir, f"col_{i}.npy"), values[order])
+            columns.append(name)
+
+        # Metadata is written last so a partial ingest is never treated as current
+        meta = {
+            "version": STORE_VERSION,
+            "source": self.fingerprint,
+            "columns": columns,
+        }
+        write_atomically(self._meta_path(), lambda f: json.dump(meta, f), mode="w")
+
+    @staticmethod
+    def _save(path: str, values: np.ndarray):
+        write_atomically(path, lambda f: np.save(f, values))
+
+    def _load(self):
+        with open(self._meta_path(), "r") as f:
+            meta = json.load(f)
+
+        self.columns = meta["columns"]
+        self.date_keys = np.load(
+            os.path.join(self.store_dir, "_date_key.npy"), mmap_mode="r"
+        )
+        self.row_index = np.load(
+            os.path.join(self.store_dir, "_row.npy"), mmap_mode="r"
+        )
+        self.column_data = [
+            np.load(os.path.join(self.store_dir, f"col_{i}.npy"), mmap_mode="r")
+            for i in range(len(self.columns))
+        ]
+
+    def is_stale(self) -> bool:
+        """Whether the source CSV changed since this store was built."""
+        try:
+            return get_source_fingerprint(self.source_path) != self.fingerprint
+        except OSError:
+            return True
+
+    def get_range(
+        self,
+        start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+        end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+    ) -> pd.DataFrame:
+        """
+        Return the rows dated within [start_date, end_date] (inclusive).
+        The frame keeps the row labels of the original CSV.
+        """
+        lo = np.searchsorted(self.date_keys, np.datetime64(start_date, "D"), "left")
+        hi = np.searchsorted(self.date_keys, np.datetime64(end_date, "D"), "right")
+
+        return pd.DataFrame(
+            {
+                name: np.asarray(values[lo:hi])
+                for name, values in zip(self.columns, self.column_data)
+            },
+            index=pd.Index(np.asarray(self.row_index[lo:hi])),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the full history in date order."""
+        return pd.DataFrame(
+            {
+                name: np.asarray(values)
+                for name, values in zip(self.columns, self.column_data)
+            },
+            index=pd.Index(np.asarray(self.row_index)),
+        )
+
+
+def get_price_store(
+    source_path: Annotated[str, "Path to a price CSV with a Date column"],
+) -> PriceStore:
+    """
+    Get the columnar store for a price CSV, building it on first use.
+    Stores are shared across calls in the process and rebuilt when the
+    source file changes.
+    """
+    source_path = os.path.abspath(source_path)
+
+    with _stores_lock:
+        store = _stores.get(source_path)
+        if store is not None and not store.is_stale():
+            return store
+
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(f"Price data file not found: {source_path}")
+
+        store_name = os.path.splitext(os.path.basename(source_path))[0]
+        store_dir = os.path.join(
+            get_config()["data_cache_dir"], "price_store", store_name
+        )
+        store = PriceStore(source_path, store_dir)
+        _stores[source_path] = store
+        return store
@@ -0,0 +1,142 @@
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Annotated, Dict, List
+
+import numpy as np
+
+from .config import get_config
+from .utils import get_source_fingerprint, write_atomically
+
+# Bump when the on-disk layout changes so stale indexes are rebuilt
+INDEX_VERSION = 1
+
+_indexes: Dict[str, "RedditIndex"] = {}
+_indexes_lock = threading.Lock()
+
+
+def post_date(post: dict) -> str:
+    """The UTC day a post was created on, in yyyy-mm-dd format."""
+    return datetime.utcfromtimestamp(post["created_utc"]).strftime("%Y-%m-%d")
+
+
+class RedditIndex:
+    """
+    Date index over one subreddit ``.jsonl`` dump.
+
+    The dump is scanned once and, for every non-empty line, its post date,
+    byte offset and length are stored sorted by date. Fetching the posts of a
+    day is then a binary search plus a seek and bounded read per post, and
+    only those posts are decoded.
+    """
+
+    def __init__(self, source_path: str, index_dir: str):
+        self.source_path = source_path
+        self.index_dir = index_dir
+        self.fingerprint = get_source_fingerprint(source_path)
+
+        if not self._is_current():
+            self._ingest()
+        self._load()
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.index_dir, "meta.json")
+
+    def _is_current(self) -> bool:
+        try:
+            with open(self._meta_path(), "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return (
+            meta.get("version") == INDEX_VERSION
+            and meta.get("source") == self.fingerprint
+        )
+
+    def _ingest(self):
+        """Scan the dump once and persist the date of every line."""
+        dates, offsets, lengths = [], [], []
+
+        with open(self.source_path, "rb") as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    dates.append(post_date(json.loads(line)))
+                    offsets.append(offset)
+                    lengths.append(len(line))
+                offset += len(line)
+
+        dates = np.array(dates, dtype="<U10")
+        order = np.argsort(dates, kind="stable")
+
+        # Every file is replaced whole so concurrent readers never see a
+        # partial one; the meta file goes last
+        os.makedirs(self.index_dir, exist_ok=True)
+        self._save(os.path.join(self.index_dir, "_date_key.npy"), dates[order])
+        self._save(
+            os.path.join(self.index_dir, "_offset.npy"),
+            np.array(offsets, dtype=np.int64)[order],
+        )
+        self._save(
+            os.path.join(self.index_dir, "_length.npy"),
+            np.array(lengths, dtype=np.int64)[order],
+        )
+
+        # Metadata is written last so a partial ingest is never treated as current
+        meta = {"version": INDEX_VERSION, "source": self.fingerprint}
+        write_atomically(self._meta_path(), lambda f: json.dump(meta, f), mode="w")
+
+    @staticmethod
+    def _save(path: str, values: np.ndarray):
+        write_atomically(path, lambda f: np.save(f, values))
+
+    def _load(self):
+        self.date_keys = np.load(os.path.join(self.index_dir, "_date_key.npy"))
+        self.offsets = np.load(os.path.join(self.index_dir, "_offset.npy"))
+        self.lengths = np.load(os.path.join(self.index_dir, "_length.npy"))
+
+    def is_stale(self) -> bool:
+        """Whether the dump changed since this index was built."""
+        try:
+            return get_source_fingerprint(self.source_path) != self.fingerprint
+        except OSError:
+            return True
+
+    def posts_on(self, date: Annotated[str, "Date in yyyy-mm-dd format"]) -> List[dict]:
+        """Return the decoded posts created on date, in file order."""
+        lo = np.searchsorted(self.date_keys, date, "left")
+        hi = np.searchsorted(self.date_keys, date, "right")
+
+        posts = []
+        with open(self.source_path, "rb") as f:
+            # The stable sort kept each day's lines in file order
+            for offset, length in zip(self.offsets[lo:hi], self.lengths[lo:hi]):
+                f.seek(int(offset))
+                posts.append(json.loads(f.read(int(length))))
+        return posts
+
+
+def get_reddit_index(
+    source_path: Annotated[str, "Path to a subreddit .jsonl dump"],
+) -> RedditIndex:
+    """
+    Get the date index for a subreddit dump, building it on first use.
+    Indexes are shared across calls in the process and rebuilt when the
+    dump changes.
+    """
+    source_path = os.path.abspath(source_path)
+
+    with _indexes_lock:
+        index = _indexes.get(source_path)
+        if index is not None and not index.is_stale():
+            return index
+
+        category = os.path.basename(os.path.dirname(source_path))
+        index_name = os.path.splitext(os.path.basename(source_path))[0]
+        index_dir = os.path.join(
+            get_config()["data_cache_dir"], "reddit_index", category, index_name
+        )
+        index = RedditIndex(source_path, index_dir)
+        _indexes[source_path] = index
+        return index
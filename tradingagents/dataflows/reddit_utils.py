@@ -3,10 +3,13 @@ import time
 import json
 from datetime import datetime, timedelta
 from contextlib import contextmanager
-from typing import Annotated
+from functools import lru_cache
+from typing import Annotated, Dict, List, Set, Tuple
 import os
 import re
 
+from .reddit_index import get_reddit_index
+
 ticker_to_company = {
     "AAPL": "Apple",
     "MSFT": "Microsoft",
@@ -49,6 +52,76 @@ ticker_to_company = {
 }
 
 
+@lru_cache(maxsize=None)
+def get_company_matcher(
+    query: Annotated[str, "Ticker symbol listed in ticker_to_company"],
+) -> re.Pattern:
+    """
+    Compiled pattern that finds any of the company's names or its ticker,
+    case-insensitively. The names are regular expressions, alternated into a
+    single pattern so each text is searched once.
+    """
+    company = ticker_to_company[query]
+    if "OR" in company:
+        search_terms = company.split(" OR ")
+    else:
+        search_terms = [company]
+
+    search_terms.append(query)
+
+    return re.compile("|".join(f"(?:{term})" for term in search_terms), re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def get_companies_matcher(
+    queries: Annotated[Tuple[str, ...], "Ticker symbols listed in ticker_to_company"],
+) -> re.Pattern:
+    """
+    Compiled pattern that finds any of several companies' names or tickers in
+    one search. Each company's matcher is the named group q<i>, i being its
+    position in queries, so a match's lastgroup maps it back to its ticker.
+    """
+    pattern = "|".join(
+        f"(?P<q{i}>{get_company_matcher(query).pattern})"
+        for i, query in enumerate(queries)
+    )
+
+    # When every name starts with a plain letter or digit, a lookahead on those
+    # characters lets the scan skip the positions where no name can start
+    terms = [
+        term
+        for query in queries
+        for term in ticker_to_company[query].split(" OR ") + [query]
+    ]
+    if all(re.match(r"\w(?![?*{])", term) and "|" not in term for term in terms):
+        first_chars = "".join(sorted({term[0].lower() for term in terms}))
+        pattern = f"(?=[{first_chars}])(?:{pattern})"
+
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def find_companies(
+    text: Annotated[str, "Text to search"],
+    queries: Annotated[Tuple[str, ...], "Ticker symbols listed in ticker_to_company"],
+) -> Set[str]:
+    """The queries whose company name or ticker appears in text."""
+    matcher = get_companies_matcher(queries)
+    found = set()
+    pos = 0
+    while len(found) < len(queries):
+        match = matcher.search(text, pos)
+        if match is None:
+            break
+        found.add(queries[int(match.lastgroup[1:])])
+        # The alternation reports one company per position; others may match
+        # at the same position too, and later positions may overlap this match
+        for query in queries:
+            if query not in found and get_company_matcher(query).match(text, match.start()):
+                found.add(query)
+        pos = match.start() + 1
+    return found
+
+
 def fetch_top_from_category(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
@@ -61,9 +134,33 @@ def fetch_top_from_category(
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
 ):
+    return fetch_top_from_category_multi(
+        category, date, max_limit, [query], data_path=data_path
+    )[query]
+
+
+def fetch_top_from_category_multi(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    date: Annotated[str, "Date to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per query."],
+    queries: Annotated[
+        List[str], "Queries (tickers) to search for in the subreddit, or None entries."
+    ],
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+) -> Dict[str, list]:
+    """
+    Fetch the top posts of a date for several queries with a single pass over
+    each subreddit file. Returns {query: posts}, each list being what
+    fetch_top_from_category returns for that query.
+    """
     base_path = data_path
 
-    all_content = []
+    all_content = {query: [] for query in queries}
 
     if max_limit < len(os.listdir(os.path.join(base_path, category))):
         raise ValueError(
@@ -74,62 +171,44 @@ def fetch_top_from_category(
         os.listdir(os.path.join(base_path, category))
     )
 
+    # company_news posts are kept for the queries whose company they mention
+    companies = tuple(sorted({query for query in queries if query}))
+    filter_companies = "company" in category and companies
+
     for data_file in os.listdir(os.path.join(base_path, category)):
         # check if data_file is a .jsonl file
         if not data_file.endswith(".jsonl"):
             continue
 
-        all_content_curr_subreddit = []
+        all_content_curr_subreddit = {query: [] for query in all_content}
 
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
-
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
+        # only the lines posted on the date are read, through the file's date index
+        index = get_reddit_index(os.path.join(base_path, category, data_file))
+        for parsed_line in index.posts_on(date):
+            if filter_companies:
+                mentioned = find_companies(parsed_line["title"], companies)
+                if len(mentioned) < len(companies):
+                    mentioned |= find_companies(parsed_line["selftext"], companies)
 
+            for query, posts in all_content_curr_subreddit.items():
                 # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
+                if filter_companies and query and query not in mentioned:
+                    continue
 
                 post = {
                     "title": parsed_line["title"],
                     "content": parsed_line["selftext"],
                     "url": parsed_line["url"],
                     "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
+                    "posted_date": date,
                 }
 
-                all_content_curr_subreddit.append(post)
+                posts.append(post)
 
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
+        for query, posts in all_content_curr_subreddit.items():
+            # sort posts by upvote_ratio in descending order
+            posts.sort(key=lambda x: x["upvotes"], reverse=True)
 
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
+            all_content[query].extend(posts[:limit_per_subreddit])
 
     return all_content
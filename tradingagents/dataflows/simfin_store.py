@@ -0,0 +1,148 @@
+import os
+import json
+import threading
+from typing import Annotated, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .utils import get_source_fingerprint, write_atomically
+
+# Bump when the cached frame layout changes so stale stores are rebuilt
+STORE_VERSION = 1
+
+_stores: Dict[str, "FundamentalsStore"] = {}
+_stores_lock = threading.Lock()
+
+
+class FundamentalsStore:
+    """
+    SimFin statement table partitioned by ticker and sorted by Publish Date.
+
+    The semicolon-separated CSV for one statement type and frequency is
+    parsed once, its date columns normalized, and the result cached as a
+    pickle under ``data_cache_dir/simfin_store``. Lookups of the latest
+    statement published on or before a date are a dict lookup for the
+    ticker's row range plus a binary search over its publish dates.
+    """
+
+    def __init__(self, source_path: str, cache_path: str):
+        self.source_path = source_path
+        self.cache_path = cache_path
+        self.fingerprint = get_source_fingerprint(source_path)
+
+        df = self._load_cached()
+        if df is None:
+            df = self._ingest()
+        self._build_index(df)
+
+    def _meta_path(self) -> str:
+        return self.cache_path + ".json"
+
+    def _load_cached(self) -> Optional[pd.DataFrame]:
+        try:
+            with open(self._meta_path(), "r") as f:
+                meta = json.load(f)
+            if (
+                meta.get("version") != STORE_VERSION
+                or meta.get("source") != self.fingerprint
+            ):
+                return None
+            return pd.read_pickle(self.cache_path)
+        except (OSError, ValueError):
+            return None
+
+    def _ingest(self) -> pd.DataFrame:
+        """Parse the statement CSV once and persist the sorted table."""
+        df = pd.read_csv(self.source_path, sep=";")
+
+        # Convert date strings to datetime objects and remove any time components
+        df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+        df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+
+        # Statements without a publish date can never be "on or before" a date
+        df = df[df["Publish Date"].notna()]
+
+        # A stable sort keeps the original row order among equal publish dates
+        df = df.sort_values(["Ticker", "Publish Date"], kind="mergesort")
+
+        # Both files are replaced whole so concurrent readers never load a partial
+        # pickle; the meta file goes last so a partial ingest is never current
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        write_atomically(self.cache_path, df.to_pickle)
+        meta = {"version": STORE_VERSION, "source": self.fingerprint}
+        write_atomically(self._meta_path(), lambda f: json.dump(meta, f), mode="w")
+
+        return df
+
+    def _build_index(self, df: pd.DataFrame):
+        self.frame = df
+        self.publish_dates = df["Publish Date"].to_numpy(dtype="datetime64[ns]")
+
+        # Each ticker occupies one contiguous block of the sorted frame
+        self.ticker_ranges = {}
+        tickers = df["Ticker"].to_numpy()
+        if len(tickers):
+            boundaries = np.flatnonzero(tickers[1:] != tickers[:-1]) + 1
+            starts = np.concatenate(([0], boundaries))
+            ends = np.concatenate((boundaries, [len(tickers)]))
+            for start, end in zip(starts, ends):
+                self.ticker_ranges[tickers[start]] = (int(start), int(end))
+
+    def is_stale(self) -> bool:
+        """Whether the source CSV changed since this store was built."""
+        try:
+            return get_source_fingerprint(self.source_path) != self.fingerprint
+        except OSError:
+            return True
+
+    def latest(
+        self,
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    ) -> Optional[pd.Series]:
+        """
+        Return the most recent statement row for ticker published on or
+        before curr_date, or None if there is none.
+        """
+        if ticker not in self.ticker_ranges:
+            return None
+        start, end = self.ticker_ranges[ticker]
+
+        curr_date_dt = np.datetime64(
+            pd.to_datetime(curr_date, utc=True).normalize().tz_localize(None), "ns"
+        )
+        dates = self.publish_dates[start:end]
+
+        pos = np.searchsorted(dates, curr_date_dt, "right") - 1
+        if pos < 0:
+            return None
+
+        # Among several statements published the same day take the first one
+        pos = np.searchsorted(dates, dates[pos], "left")
+        return self.frame.iloc[start + pos]
+
+
+def get_simfin_store(
+    source_path: Annotated[str, "Path to a SimFin us-*-{freq}.csv file"],
+) -> FundamentalsStore:
+    """
+    Get the indexed store for a SimFin statement file, building it on first
+    use. Stores are shared across calls in the process and rebuilt when the
+    source file changes.
+    """
+    source_path = os.path.abspath(source_path)
+
+    with _stores_lock:
+        store = _stores.get(source_path)
+        if store is not None and not store.is_stale():
+            return store
+
+        store_name = os.path.splitext(os.path.basename(source_path))[0]
+        cache_path = os.path.join(
+            get_config()["data_cache_dir"], "simfin_store", f"{store_name}.pkl"
+        )
+        store = FundamentalsStore(source_path, cache_path)
+        _stores[source_path] = store
+        return store
@@ -1,15 +1,41 @@
 import os
+import logging
 import json
+import threading
 import pandas as pd
 from datetime import date, timedelta, datetime
-from typing import Annotated
+from typing import IO, Annotated, Callable
+
+logger = logging.getLogger(__name__)
 
 SavePathType = Annotated[str, "File path to save data. If None, data is not saved."]
 
 def save_output(data: pd.DataFrame, tag: str, save_path: SavePathType = None) -> None:
     if save_path:
         data.to_csv(save_path)
-        print(f"{tag} saved to {save_path}")
+        logger.info("%s saved to %s", tag, save_path)
+
+
+def get_source_fingerprint(source_path: str) -> dict:
+    """Identify a source file's version by its size and modification time."""
+    stat = os.stat(source_path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def write_atomically(path: str, write: Callable[[IO], None], mode: str = "wb") -> None:
+    """
+    Write a file through write(f) to a temporary file next to path and move
+    it into place. Readers, including memory maps of the file being
+    replaced, only ever see the old or the new file in full.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, mode) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 
 def get_current_date():
@@ -0,0 +1,237 @@
+import os
+import re
+import time
+import pickle
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .config import get_config
+
+_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# Failures several vendors report as strings instead of raising, matched on the
+# first line: "Error ..." messages, "No ... data found for symbol ..." notices,
+# rate limit notices and Alpha Vantage's JSON error payloads
+_FAILURE_PATTERN = re.compile(
+    r"""\A\s*(?:
+        error\b
+        | no\b[^\n]*\bfound\b
+        | [^\n]*\brate[\s-]limit
+        | \{\s*"(?:Error\ Message|Information|Note)"
+    )""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+_cache: Optional["VendorCache"] = None
+_cache_settings: Optional[tuple] = None
+_cache_lock = threading.Lock()
+
+
+def _normalize_value(value):
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize_value(v) for v in value)
+    return value
+
+
+def make_cache_key(
+    method: str, vendor: str, impl_func: Callable, args: tuple, kwargs: dict
+) -> tuple:
+    """
+    Build a hashable key for a vendor call. Arguments are bound to the
+    implementation's signature with defaults applied, so positional and
+    keyword spellings of the same call share one entry.
+    """
+    try:
+        bound = inspect.signature(impl_func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = tuple(
+            (name, _normalize_value(value)) for name, value in bound.arguments.items()
+        )
+    except (TypeError, ValueError):
+        arguments = tuple(
+            (str(i), _normalize_value(v)) for i, v in enumerate(args)
+        ) + tuple(sorted((k, _normalize_value(v)) for k, v in kwargs.items()))
+
+    impl_name = f"{impl_func.__module__}.{impl_func.__qualname__}"
+    return (method, vendor, impl_name, arguments)
+
+
+def _is_historical(key: tuple) -> bool:
+    """
+    A query is historical when it mentions at least one yyyy-mm-dd date and
+    all of them lie strictly before today. Its result can never change.
+    """
+    today = date.today().isoformat()
+    dates = []
+    for _, value in key[3]:
+        if isinstance(value, str) and _DATE_PATTERN.match(value):
+            dates.append(value)
+    return bool(dates) and max(dates) < today
+
+
+def _is_cacheable(result) -> bool:
+    if result is None:
+        return False
+    if isinstance(result, str):
+        return result.strip() != "" and not _FAILURE_PATTERN.match(result)
+    return True
+
+
+class VendorCache:
+    """
+    Bounded LRU cache of vendor results.
+
+    Entries for historical queries never expire; every other entry expires
+    ``ttl`` seconds after it was stored. When ``persist_dir`` is set,
+    historical entries are also pickled to disk so later processes can reuse
+    them.
+    """
+
+    def __init__(
+        self, max_entries: int = 512, ttl: float = 900, persist_dir: str = None
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.persist_dir = persist_dir
+        self._entries: "OrderedDict[tuple, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+
+    def _disk_path(self, key: tuple) -> str:
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.persist_dir, f"{digest}.pkl")
+
+    def _load_from_disk(self, key: tuple):
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                stored_key, value = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError, ValueError):
+            return False, None
+        if stored_key != key:
+            return False, None
+        return True, value
+
+    def _save_to_disk(self, key: tuple, value):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump((key, value), f)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PickleError, TypeError, AttributeError):
+            # Unpicklable results simply stay memory-only
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get(self, key: tuple) -> Tuple[bool, Any]:
+        """Return (hit, value) for key."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+
+        if self.persist_dir and _is_historical(key):
+            found, value = self._load_from_disk(key)
+            if found:
+                with self._lock:
+                    self._store(key, None, value)
+                    self.hits += 1
+                return True, value
+
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def put(self, key: tuple, value):
+        """Store value for key with the expiry its query dates call for."""
+        historical = _is_historical(key)
+        expires_at = None if historical else time.monotonic() + self.ttl
+
+        with self._lock:
+            self._store(key, expires_at, value)
+
+        if self.persist_dir and historical:
+            self._save_to_disk(key, value)
+
+    def _store(self, key, expires_at, value):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def call(
+        self,
+        method: str,
+        vendor: str,
+        impl_func: Callable,
+        args: tuple,
+        kwargs: dict,
+    ):
+        """Return the cached result of impl_func(*args, **kwargs), computing it on a miss."""
+        key = make_cache_key(method, vendor, impl_func, args, kwargs)
+        hit, value = self.get(key)
+        if hit:
+            return value
+
+        value = impl_func(*args, **kwargs)
+        if _is_cacheable(value):
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+
+def get_vendor_cache() -> Optional[VendorCache]:
+    """
+    Get the process-wide vendor cache for the current configuration, or
+    None when caching is disabled. The cache is recreated if its settings
+    change.
+    """
+    global _cache, _cache_settings
+
+    config = get_config()
+    if not config.get("vendor_cache_enabled", True):
+        return None
+
+    persist_dir = None
+    if config.get("vendor_cache_persist", False):
+        persist_dir = os.path.join(config["data_cache_dir"], "vendor_cache")
+
+    settings = (
+        config.get("vendor_cache_max_entries", 512),
+        config.get("vendor_cache_ttl", 900),
+        persist_dir,
+    )
+
+    with _cache_lock:
+        if _cache is None or _cache_settings != settings:
+            _cache = VendorCache(*settings)
+            _cache_settings = settings
+        return _cache
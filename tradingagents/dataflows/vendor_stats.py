@@ -0,0 +1,122 @@
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .config import get_config
+
+_stats: Optional["VendorStats"] = None
+_stats_settings: Optional[tuple] = None
+_stats_lock = threading.Lock()
+
+
+class VendorStats:
+    """
+    Rolling latency and error samples per (method, vendor).
+
+    Only the last ``window`` calls of each pair are kept, so the numbers
+    follow a vendor that slows down or starts failing (e.g. at market open or
+    after quota exhaustion). Nothing is reported for a pair until it has
+    ``min_samples`` calls.
+    """
+
+    def __init__(
+        self, window: int = 100, min_samples: int = 5, max_error_rate: float = 0.5
+    ):
+        self.window = window
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self._samples: Dict[Tuple[str, str], Deque[Tuple[float, bool]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, vendor: str, latency: float, ok: bool):
+        """Record one call taking latency seconds that succeeded or raised."""
+        with self._lock:
+            samples = self._samples.get((method, vendor))
+            if samples is None:
+                samples = deque(maxlen=self.window)
+                self._samples[(method, vendor)] = samples
+            samples.append((latency, ok))
+
+    def _get_samples(self, method: str, vendor: str) -> List[Tuple[float, bool]]:
+        with self._lock:
+            return list(self._samples.get((method, vendor), ()))
+
+    def latency_percentile(
+        self, method: str, vendor: str, percentile: float
+    ) -> Optional[float]:
+        """Latency in seconds below which percentile % of recent successful calls finished."""
+        latencies = sorted(
+            latency for latency, ok in self._get_samples(method, vendor) if ok
+        )
+        if len(latencies) < self.min_samples:
+            return None
+        rank = min(len(latencies) - 1, int(len(latencies) * percentile / 100))
+        return latencies[rank]
+
+    def error_rate(self, method: str, vendor: str) -> Optional[float]:
+        samples = self._get_samples(method, vendor)
+        if len(samples) < self.min_samples:
+            return None
+        return sum(1 for _, ok in samples if not ok) / len(samples)
+
+    def is_healthy(self, method: str, vendor: str) -> bool:
+        error_rate = self.error_rate(method, vendor)
+        return error_rate is None or error_rate < self.max_error_rate
+
+    def rank(self, method: str, vendors: List[str]) -> List[str]:
+        """
+        Order vendors fastest first: healthy vendors by median latency, then
+        vendors without enough samples in their given order, then unhealthy
+        vendors in their given order.
+        """
+
+        def sort_key(item):
+            position, vendor = item
+            if not self.is_healthy(method, vendor):
+                return (2, 0.0, position)
+            median = self.latency_percentile(method, vendor, 50)
+            if median is None:
+                return (1, 0.0, position)
+            return (0, median, position)
+
+        return [vendor for _, vendor in sorted(enumerate(vendors), key=sort_key)]
+
+    def summary(self) -> Dict[str, Dict[str, dict]]:
+        """Recent call count, error rate and p50/p95 latency per method and vendor."""
+        with self._lock:
+            pairs = list(self._samples)
+
+        summary: Dict[str, Dict[str, dict]] = {}
+        for method, vendor in pairs:
+            summary.setdefault(method, {})[vendor] = {
+                "calls": len(self._get_samples(method, vendor)),
+                "error_rate": self.error_rate(method, vendor),
+                "p50": self.latency_percentile(method, vendor, 50),
+                "p95": self.latency_percentile(method, vendor, 95),
+            }
+        return summary
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+def get_vendor_stats() -> VendorStats:
+    """
+    Get the process-wide vendor statistics for the current configuration.
+    They are reset if their settings change.
+    """
+    global _stats, _stats_settings
+
+    config = get_config()
+    settings = (
+        config.get("vendor_stats_window", 100),
+        config.get("vendor_stats_min_samples", 5),
+        config.get("vendor_max_error_rate", 0.5),
+    )
+
+    with _stats_lock:
+        if _stats is None or _stats_settings != settings:
+            _stats = VendorStats(*settings)
+            _stats_settings = settings
+        return _stats
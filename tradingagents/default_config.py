@@ -13,10 +13,27 @@ DEFAULT_CONFIG = {
     "deep_think_llm": "o4-mini",
     "quick_think_llm": "gpt-4o-mini",
     "backend_url": "https://api.openai.com/v1",
+    # Requests per second allowed per LLM provider, e.g. {"openai": 5}; unlisted providers are not limited
+    "llm_rate_limits": {},
+    # Directory where agent memories are persisted, one subdirectory per memory;
+    # None keeps them in memory for the lifetime of the process
+    "memory_dir": None,
+    "embedding_batch_size": 256,  # Texts per embeddings request when adding memories
     # Debate and discussion settings
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # Approximate tokens of reports and debate history per bull/bear/risk debater prompt.
+    # Reports are sent in full only in each debater's opening argument, then as digests,
+    # and turns older than debate_recent_turns are summarized; None sends everything,
+    # "auto" bounds prompts to 6000 tokens only in debates of more than one round
+    "debate_context_budget": "auto",
+    "debate_recent_turns": 2,
+    # Run the selected analysts concurrently instead of one after another
+    "parallel_analysts": False,
+    # Record per-node wall time, LLM/tool time and tokens of each run, written as a
+    # Chrome trace (node_profile_<date>.json) next to the state log
+    "profile_nodes": False,
     # Data vendor configuration
     # Category-level configuration (default for all tools in category)
     "data_vendors": {
@@ -30,4 +47,40 @@ DEFAULT_CONFIG = {
         # Example: "get_stock_data": "alpha_vantage",  # Override category default
         # Example: "get_news": "openai",               # Override category default
     },
+    # Run every implementation of a vendor (e.g. local get_news) and every vendor of a
+    # comma-separated config concurrently, merging results in the configured order
+    "vendor_fanout": False,
+    "vendor_fanout_workers": 8,  # Worker threads per vendor
+    "vendor_timeout": 30,  # Seconds a concurrent vendor call may take before it counts as failed
+    # Vendor order for single-vendor configs: "ordered" keeps the configured fallback
+    # order, "fastest" tries healthy vendors by recent median latency first
+    "vendor_selection": "ordered",
+    # Also start the next vendor once a call exceeds this percentile of the vendor's
+    # recent latency, e.g. 95; None disables hedged requests
+    "vendor_hedge_percentile": None,
+    "vendor_stats_window": 100,      # Recent calls kept per method and vendor
+    "vendor_stats_min_samples": 5,   # Calls needed before a vendor's stats are used
+    "vendor_max_error_rate": 0.5,    # Recent error rate at which a vendor is ranked last
+    # Skip a vendor of a tool after this many consecutive rate limit, connection, timeout
+    # or server errors, probing it again once the cooldown has passed (seconds;
+    # per-vendor overrides in vendor_breaker_cooldowns)
+    "vendor_circuit_breaker": True,
+    "vendor_breaker_failure_threshold": 5,
+    "vendor_breaker_cooldown": 60,
+    "vendor_breaker_cooldowns": {},  # Example: {"alpha_vantage": 3600} after daily quota exhaustion
+    # Counters and histograms for vendor calls (attempts, fallbacks, latency, bytes);
+    # written at exit to metrics_file, as Prometheus text when it ends with .prom
+    "metrics_enabled": False,
+    "metrics_file": None,
+    # Alpha Vantage client
+    "alpha_vantage_requests_per_minute": 75,  # Match your plan; None disables client-side limiting
+    "alpha_vantage_max_wait": 30,             # Seconds a request may queue before falling back to another vendor
+    "alpha_vantage_timeout": 30,              # Seconds per HTTP request
+    "alpha_vantage_max_workers": 4,           # Parallel requests for multi-indicator fetches
+    "alpha_vantage_series_cache_size": 32,    # Full daily series kept in memory; others are re-read from data_cache_dir
+    # Vendor result cache shared by all tool calls in the process
+    "vendor_cache_enabled": True,
+    "vendor_cache_max_entries": 512,
+    "vendor_cache_ttl": 900,        # Seconds; queries dated entirely in the past never expire
+    "vendor_cache_persist": False,  # Also keep past-dated results under data_cache_dir/vendor_cache
 }
@@ -0,0 +1,213 @@
+# TradingAgents/graph/profiler.py
+
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Bucket for LLM and tool calls made outside the graph's nodes
+OUTSIDE_GRAPH = "(outside graph)"
+
+
+def _new_node_stats() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "wall_time": 0.0,
+        "llm_calls": 0,
+        "llm_time": 0.0,
+        "tool_calls": 0,
+        "tool_time": 0.0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "errors": 0,
+    }
+
+
+def _token_usage(response) -> tuple:
+    """Prompt and completion tokens reported for an LLMResult, (0, 0) if unknown."""
+    prompt_tokens = completion_tokens = 0
+    found = False
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+                found = True
+    if not found:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+    return prompt_tokens, completion_tokens
+
+
+class NodeProfiler(BaseCallbackHandler):
+    """
+    Callback handler that times every node of one graph run.
+
+    Graph nodes are recognised by LangGraph's ``langgraph_node`` metadata,
+    which is inherited by the LLM and tool runs inside them, so each node
+    gets its wall time plus the time, count and token usage of its LLM and
+    tool calls, and how often they failed. Every span is also kept as a
+    Chrome trace event (one lane per node), viewable in chrome://tracing or
+    Perfetto.
+    """
+
+    # Callbacks only take a lock, so run them inline on the event loop in async runs
+    run_inline = True
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.events: List[dict] = []
+        self._open: Dict[UUID, tuple] = {}
+        self._run_nodes: Dict[UUID, str] = {}
+        self._lanes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self.start) * 1e6
+
+    def _lane(self, node: str) -> int:
+        lane = self._lanes.get(node)
+        if lane is None:
+            lane = len(self._lanes) + 1
+            self._lanes[node] = lane
+        return lane
+
+    def _begin(self, run_id: UUID, kind: str, node: str, name: str):
+        start = self._now_us()
+        with self._lock:
+            self._open[run_id] = (kind, node, name, start)
+
+    def _finish(self, run_id: UUID, error: BaseException = None, tokens: tuple = None):
+        end = self._now_us()
+        with self._lock:
+            entry = self._open.pop(run_id, None)
+            if entry is None:
+                return
+            kind, node, name, start = entry
+            seconds = (end - start) / 1e6
+
+            stats = self.nodes.setdefault(node, _new_node_stats())
+            if kind == "node":
+                stats["calls"] += 1
+                stats["wall_time"] += seconds
+            else:
+                stats[f"{kind}_calls"] += 1
+                stats[f"{kind}_time"] += seconds
+            if error is not None:
+                stats["errors"] += 1
+
+            args = {"node": node}
+            if tokens is not None:
+                stats["prompt_tokens"] += tokens[0]
+                stats["completion_tokens"] += tokens[1]
+                args.update(prompt_tokens=tokens[0], completion_tokens=tokens[1])
+            if error is not None:
+                args["error"] = repr(error)
+
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": kind,
+                    "ph": "X",
+                    "ts": start,
+                    "dur": end - start,
+                    "pid": 1,
+                    "tid": self._lane(node),
+                    "args": args,
+                }
+            )
+
+    @staticmethod
+    def _node_of(metadata: Optional[dict]) -> Optional[str]:
+        """
+        The node a run belongs to. Nodes of subgraphs (e.g. the parallel
+        analyst branches) are named by their path, "Market Analyst/tools_market".
+        """
+        metadata = metadata or {}
+        namespace = metadata.get("langgraph_checkpoint_ns")
+        if namespace:
+            return "/".join(part.split(":", 1)[0] for part in namespace.split("|"))
+        return metadata.get("langgraph_node")
+
+    # Graph nodes
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        node = self._node_of(metadata)
+        if node is None:
+            return
+        with self._lock:
+            self._run_nodes[run_id] = node
+        # Only the node's own run, not the chains nested inside it
+        if kwargs.get("name") == metadata.get("langgraph_node"):
+            self._begin(run_id, "node", node, node)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=error)
+
+    # LLM calls
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name", "llm")
+        self._begin(run_id, "llm", self._node_of(metadata) or OUTSIDE_GRAPH, name)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name", "llm")
+        self._begin(run_id, "llm", self._node_of(metadata) or OUTSIDE_GRAPH, name)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id, tokens=_token_usage(response))
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=error)
+
+    # Tool calls
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name", "tool")
+        self._begin(run_id, "tool", self._node_of(metadata) or OUTSIDE_GRAPH, name)
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, error=error)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-node totals, slowest node first."""
+        with self._lock:
+            nodes = {node: dict(stats) for node, stats in self.nodes.items()}
+        return dict(
+            sorted(nodes.items(), key=lambda item: item[1]["wall_time"], reverse=True)
+        )
+
+    def to_chrome_trace(self) -> dict:
+        with self._lock:
+            events = list(self.events)
+            lanes = dict(self._lanes)
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": lane, "args": {"name": node}}
+            for node, lane in lanes.items()
+        ]
+        return {
+            "traceEvents": metadata + sorted(events, key=lambda event: event["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {"nodes": self.summary()},
+        }
+
+    def write_chrome_trace(self, path) -> Path:
+        """Write the run's timeline and per-node totals as Chrome trace JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f, indent=1)
+        return path
@@ -1,11 +1,16 @@
 # TradingAgents/graph/trading_graph.py
 
 import os
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import json
 from datetime import date
 from typing import Dict, Any, Tuple, List, Optional
 
+from langchain_core.rate_limiters import InMemoryRateLimiter
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -26,6 +31,7 @@ from tradingagents.dataflows.config import set_config
 from tradingagents.agents.utils.agent_utils import (
     get_stock_data,
     get_indicators,
+    get_indicators_batch,
     get_fundamentals,
     get_balance_sheet,
     get_cashflow,
@@ -41,6 +47,7 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .profiler import NodeProfiler
 
 
 class TradingAgentsGraph:
@@ -71,16 +78,19 @@ class TradingAgentsGraph:
             exist_ok=True,
         )
 
+        # Both LLMs share one request budget per provider
+        rate_limiter = self._create_rate_limiter()
+
         # Initialize LLMs
         if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], rate_limiter=rate_limiter)
+            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], rate_limiter=rate_limiter)
         elif self.config["llm_provider"].lower() == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], rate_limiter=rate_limiter)
+            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], rate_limiter=rate_limiter)
         elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
+            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"], rate_limiter=rate_limiter)
+            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"], rate_limiter=rate_limiter)
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
         
@@ -95,7 +105,10 @@ class TradingAgentsGraph:
         self.tool_nodes = self._create_tool_nodes()
 
         # Initialize components
-        self.conditional_logic = ConditionalLogic()
+        self.conditional_logic = ConditionalLogic(
+            max_debate_rounds=self.config["max_debate_rounds"],
+            max_risk_discuss_rounds=self.config["max_risk_discuss_rounds"],
+        )
         self.graph_setup = GraphSetup(
             self.quick_thinking_llm,
             self.deep_thinking_llm,
@@ -115,10 +128,26 @@ class TradingAgentsGraph:
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        self.last_profile = None  # per-node totals of the last profiled run
+        self.log_states_dict = {}  # ticker to {date: full state dict}
+        self._log_lock = threading.Lock()
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            parallel_analysts=self.config.get("parallel_analysts", False),
+        )
+
+    def _create_rate_limiter(self) -> Optional[InMemoryRateLimiter]:
+        """Create the request rate limiter for the configured LLM provider, if any."""
+        rate_limits = self.config.get("llm_rate_limits") or {}
+        requests_per_second = rate_limits.get(self.config["llm_provider"].lower())
+        if not requests_per_second:
+            return None
+        return InMemoryRateLimiter(
+            requests_per_second=requests_per_second,
+            max_bucket_size=max(1, requests_per_second),
+        )
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources using abstract methods."""
@@ -129,6 +158,7 @@ class TradingAgentsGraph:
                     get_stock_data,
                     # Technical indicators
                     get_indicators,
+                    get_indicators_batch,
                 ]
             ),
             "social": ToolNode(
@@ -160,13 +190,23 @@ class TradingAgentsGraph:
     def propagate(self, company_name, trade_date):
         """Run the trading agents graph for a company on a specific date."""
 
+        final_state, decision = self._run_graph(company_name, trade_date)
+
+        # Store current state for reflection
         self.ticker = company_name
+        self.curr_state = final_state
+
+        return final_state, decision
+
+    def _run_graph(self, company_name, trade_date):
+        """propagate without keeping the run on the instance, so runs can share it."""
 
         # Initialize state
         init_agent_state = self.propagator.create_initial_state(
             company_name, trade_date
         )
         args = self.propagator.get_graph_args()
+        profiler = self._attach_profiler(args)
 
         if self.debug:
             # Debug mode with tracing
@@ -183,18 +223,169 @@ class TradingAgentsGraph:
             # Standard mode without tracing
             final_state = self.graph.invoke(init_agent_state, **args)
 
-        # Store current state for reflection
-        self.curr_state = final_state
-
         # Log state
         self._log_state(trade_date, final_state)
+        if profiler is not None:
+            self._log_profile(trade_date, final_state, profiler)
 
         # Return decision and processed signal
         return final_state, self.process_signal(final_state["final_trade_decision"])
 
+    async def apropagate(self, company_name, trade_date):
+        """Async variant of propagate.
+
+        Every agent awaits its LLM calls and data tools run in worker threads,
+        so many ticker/date analyses can be awaited concurrently on one event
+        loop, e.g. with asyncio.gather. Unlike propagate it does not keep the
+        run in self.ticker and self.curr_state, which concurrent runs would
+        overwrite; pass the returned final state to reflect_and_remember.
+        """
+
+        # Initialize state
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date
+        )
+        args = self.propagator.get_graph_args()
+        profiler = self._attach_profiler(args)
+
+        if self.debug:
+            # Debug mode with tracing
+            trace = []
+            async for chunk in self.graph.astream(init_agent_state, **args):
+                if len(chunk["messages"]) == 0:
+                    pass
+                else:
+                    chunk["messages"][-1].pretty_print()
+                    trace.append(chunk)
+
+            final_state = trace[-1]
+        else:
+            # Standard mode without tracing
+            final_state = await self.graph.ainvoke(init_agent_state, **args)
+
+        # Log state
+        self._log_state(trade_date, final_state)
+        if profiler is not None:
+            self._log_profile(trade_date, final_state, profiler)
+
+        # Return decision and processed signal
+        return final_state, await self.aprocess_signal(
+            final_state["final_trade_decision"]
+        )
+
+    def propagate_batch(self, tickers, dates, max_concurrency=4):
+        """Run the graph for every ticker on every date, yielding results as they complete.
+
+        All runs share this graph, its LLM clients and the data caches, and at
+        most max_concurrency of them are in flight at once. Each result is a
+        dict with the ticker, trade_date, final_state and decision of the run
+        (or the exception in error if it failed), its wall-clock seconds in
+        elapsed and the batch throughput so far in analyses per minute. Runs
+        are not kept in self.curr_state; pass a result's final_state to
+        reflect_and_remember instead.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        runs = [(ticker, trade_date) for trade_date in dates for ticker in tickers]
+        batch_start = time.perf_counter()
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        try:
+            futures = [
+                executor.submit(self._run_timed, self._run_graph, ticker, trade_date)
+                for ticker, trade_date in runs
+            ]
+            for completed, future in enumerate(as_completed(futures), 1):
+                yield self._with_throughput(future.result(), completed, batch_start)
+        finally:
+            # Drop queued runs if the caller stops consuming early
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def apropagate_batch(self, tickers, dates, max_concurrency=4):
+        """Async variant of propagate_batch, running every analysis on the current event loop."""
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        runs = [(ticker, trade_date) for trade_date in dates for ticker in tickers]
+        batch_start = time.perf_counter()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(ticker, trade_date):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    final_state, decision = await self.apropagate(ticker, trade_date)
+                    error = None
+                except Exception as e:
+                    final_state, decision, error = None, None, e
+                return self._run_result(
+                    ticker, trade_date, final_state, decision, error, start
+                )
+
+        tasks = [asyncio.ensure_future(run(ticker, trade_date)) for ticker, trade_date in runs]
+        try:
+            for completed, next_done in enumerate(asyncio.as_completed(tasks), 1):
+                yield self._with_throughput(await next_done, completed, batch_start)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Let cancelled runs unwind before the caller moves on
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _run_timed(self, propagate, ticker, trade_date):
+        start = time.perf_counter()
+        try:
+            final_state, decision = propagate(ticker, trade_date)
+            error = None
+        except Exception as e:
+            final_state, decision, error = None, None, e
+        return self._run_result(ticker, trade_date, final_state, decision, error, start)
+
+    @staticmethod
+    def _run_result(ticker, trade_date, final_state, decision, error, start):
+        return {
+            "ticker": ticker,
+            "trade_date": trade_date,
+            "final_state": final_state,
+            "decision": decision,
+            "error": error,
+            "elapsed": time.perf_counter() - start,
+        }
+
+    @staticmethod
+    def _with_throughput(result, completed, batch_start):
+        minutes = (time.perf_counter() - batch_start) / 60
+        result["throughput"] = completed / minutes if minutes > 0 else 0.0
+        return result
+
+    def _attach_profiler(self, args):
+        """Add a NodeProfiler to the graph args when profile_nodes is enabled."""
+        if not self.config.get("profile_nodes", False):
+            return None
+        profiler = NodeProfiler()
+        callbacks = args["config"].get("callbacks")
+        if callbacks is None:
+            callbacks = [profiler]
+        elif isinstance(callbacks, list):
+            callbacks = callbacks + [profiler]
+        else:
+            # A callback manager; copied so the caller's manager is left as it was
+            callbacks = callbacks.copy()
+            callbacks.add_handler(profiler)
+        args["config"] = {**args["config"], "callbacks": callbacks}
+        return profiler
+
+    def _log_profile(self, trade_date, final_state, profiler):
+        """Write the run's per-node timeline next to its state log."""
+        ticker = final_state["company_of_interest"]
+        self.last_profile = profiler.summary()
+        profiler.write_chrome_trace(
+            f"eval_results/{ticker}/TradingAgentsStrategy_logs/node_profile_{trade_date}.json"
+        )
+
     def _log_state(self, trade_date, final_state):
         """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        ticker = final_state["company_of_interest"]
+        state_log = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -224,34 +415,49 @@ class TradingAgentsGraph:
             "final_trade_decision": final_state["final_trade_decision"],
         }
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
+        # Save to file. The ticker comes from the state rather than self.ticker
+        # so concurrent runs on one graph log to their own directories.
+        directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
         directory.mkdir(parents=True, exist_ok=True)
 
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+        with self._log_lock:
+            ticker_states = self.log_states_dict.setdefault(ticker, {})
+            ticker_states[str(trade_date)] = state_log
+
+            with open(
+                f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
+                "w",
+            ) as f:
+                json.dump(ticker_states, f, indent=4)
 
-    def reflect_and_remember(self, returns_losses):
-        """Reflect on decisions and update memory based on returns."""
+    def reflect_and_remember(self, returns_losses, final_state=None):
+        """Reflect on decisions and update memory based on returns.
+
+        final_state is the state returned by the run to reflect on, by default
+        the last run of propagate.
+        """
+        if final_state is None:
+            final_state = self.curr_state
         self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
+            final_state, returns_losses, self.bull_memory
         )
         self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
+            final_state, returns_losses, self.bear_memory
         )
         self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
+            final_state, returns_losses, self.trader_memory
         )
         self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
+            final_state, returns_losses, self.invest_judge_memory
         )
         self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
+            final_state, returns_losses, self.risk_manager_memory
         )
 
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)
+
+    async def aprocess_signal(self, full_signal):
+        """Async variant of process_signal."""
+        return await self.signal_processor.aprocess_signal(full_signal)